@@ -28,24 +28,18 @@ PYTHON_AGENT_DIR = SCRIPT_DIR / "python-agent"
 OUTPUT_DIR = Path(args.output_dir)
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-def build_windows_agent():
-    """Build the Windows agent package"""
-    print(f"Building Windows agent package...")
-    
-    # In a production environment, you would use PyInstaller or similar to build an actual executable
-    # For demo purposes, we'll create a batch file that simulates the agent installation
-    
-    output_file = OUTPUT_DIR / f"ActivTrack_Windows_Setup_{args.org_id or 'default'}.exe"
-    
-    with open(output_file, 'w') as f:
-        f.write(f'''@echo off
+# Installer stub templates per platform: (output file name, file body).
+# Both are rendered with str.format_map() against the build context, so
+# literal braces meant for the generated file are doubled.
+_TEMPLATES = {
+    "windows": ("ActivTrack_Windows_Setup_{build_id}.exe", '''@echo off
 echo ===================================
 echo ActivTrack Agent Installation Script
 echo ===================================
 echo.
-echo Organization ID: {args.org_id or "Not provided (will use default)"}
-echo API URL: {args.api_url}
-echo WebSocket URL: {args.ws_url}
+echo Organization ID: {org_label}
+echo API URL: {api_url}
+echo WebSocket URL: {ws_url}
 echo.
 echo This script would install the ActivTrack agent on your Windows system.
 echo In a real environment, this would:
@@ -61,30 +55,15 @@ echo Installation complete!
 echo.
 echo Press any key to exit...
 pause > nul
-''')
-    
-    os.chmod(output_file, 0o755)  # Make executable
-    print(f"Windows agent package built: {output_file}")
-    return output_file
-
-def build_macos_agent():
-    """Build the macOS agent package"""
-    print(f"Building macOS agent package...")
-    
-    # In a production environment, you would use PyInstaller or pkgbuild to create a real package
-    # For demo purposes, we'll create a shell script that simulates the agent installation
-    
-    output_file = OUTPUT_DIR / f"ActivTrack_macOS_{args.org_id or 'default'}.pkg"
-    
-    with open(output_file, 'w') as f:
-        f.write(f'''#!/bin/bash
+'''),
+    "macos": ("ActivTrack_macOS_{build_id}.pkg", '''#!/bin/bash
 echo "==================================="
 echo "ActivTrack Agent Installation Script"
 echo "==================================="
 echo
-echo "Organization ID: {args.org_id or "Not provided (will use default)"}"
-echo "API URL: {args.api_url}"
-echo "WebSocket URL: {args.ws_url}"
+echo "Organization ID: {org_label}"
+echo "API URL: {api_url}"
+echo "WebSocket URL: {ws_url}"
 echo
 echo "This script would install the ActivTrack agent on your macOS system."
 echo "In a real environment, this would:"
@@ -100,24 +79,8 @@ echo "Installation complete!"
 echo
 echo "Press Enter to exit..."
 read
-''')
-    
-    os.chmod(output_file, 0o755)  # Make executable
-    print(f"macOS agent package built: {output_file}")
-    return output_file
-
-def build_python_agent():
-    """Build the Python cross-platform agent package"""
-    print(f"Building Python cross-platform agent package...")
-    
-    # Create a zip file with the Python agent files
-    output_file = OUTPUT_DIR / f"ActivTrack_Python_Agent_{args.org_id or 'default'}.exe"
-    
-    # In a real environment, this would pack all necessary files
-    # For demo, we'll create a Python executable stub
-    
-    with open(output_file, 'w') as f:
-        f.write(f'''#!/usr/bin/env python3
+'''),
+    "python": ("ActivTrack_Python_Agent_{build_id}.exe", '''#!/usr/bin/env python3
 import os
 import sys
 import platform
@@ -127,9 +90,9 @@ print("===================================")
 print("ActivTrack Python Agent Installer")
 print("===================================")
 print()
-print(f"Organization ID: {args.org_id or 'Not provided (will use default)'}")
-print(f"API URL: {args.api_url}")
-print(f"WebSocket URL: {args.ws_url}")
+print("Organization ID: {org_label}")
+print("API URL: {api_url}")
+print("WebSocket URL: {ws_url}")
 print()
 print("This script would install the ActivTrack agent on your system.")
 print("In a real environment, this would:")
@@ -140,17 +103,47 @@ print("  4. Create a configuration file with the provided organization ID")
 print("  5. Setup autostart based on your operating system")
 print("  6. Start the agent in background")
 print()
-print(f"Detected system: {platform.system()} {platform.release()}")
+print(f"Detected system: {{platform.system()}} {{platform.release()}}")
 print()
 print("For this demonstration, we're simulating these steps.")
 print()
 print("Installation complete!")
 print()
 input("Press Enter to exit...")
-''')
+'''),
+}
+
+# Human-readable names used in build output
+_PLATFORM_LABELS = {
+    "windows": "Windows",
+    "macos": "macOS",
+    "python": "Python cross-platform",
+}
+
+def build_context():
+    """Values substituted into the installer stub templates"""
+    return {
+        "build_id": args.org_id or "default",
+        "org_label": args.org_id or "Not provided (will use default)",
+        "api_url": args.api_url,
+        "ws_url": args.ws_url,
+    }
+
+def build_agent(platform_name, ctx):
+    """Build the agent package for one platform from its template"""
+    label = _PLATFORM_LABELS[platform_name]
+    print(f"Building {label} agent package...")
     
-    os.chmod(output_file, 0o755)  # Make executable
-    print(f"Python agent package built: {output_file}")
+    # In a production environment, you would use PyInstaller, pkgbuild or similar
+    # to build a real installer. For demo purposes, we'll create a script that
+    # simulates the agent installation
+    name_fmt, body_fmt = _TEMPLATES[platform_name]
+    output_file = OUTPUT_DIR / name_fmt.format_map(ctx)
+    
+    output_file.write_bytes(body_fmt.format_map(ctx).encode())
+    output_file.chmod(0o755)  # Make executable
+    
+    print(f"{label} agent package built: {output_file}")
     return output_file
 
 def create_agent_info(agent_file, platform_name):
@@ -182,15 +175,11 @@ def main():
     print(f"  Output directory: {OUTPUT_DIR}")
     print()
     
-    # Build agents for each platform
-    windows_agent = build_windows_agent()
-    macos_agent = build_macos_agent()
-    python_agent = build_python_agent()
-    
-    # Create info files
-    create_agent_info(windows_agent, "windows")
-    create_agent_info(macos_agent, "macos")
-    create_agent_info(python_agent, "python")
+    # Build agents for each platform, then their info files
+    ctx = build_context()
+    for platform_name in _TEMPLATES:
+        agent_file = build_agent(platform_name, ctx)
+        create_agent_info(agent_file, platform_name)
     
     print()
     print(f"All agent packages built successfully in: {OUTPUT_DIR}")
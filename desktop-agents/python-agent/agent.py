@@ -10,31 +10,85 @@ import sys
 import time
 import json
 import logging
+import logging.handlers
 import platform
 import signal
 import subprocess
 import threading
-import queue
 import datetime
 import getpass
 import re
 import uuid
 import argparse
 import socket
+import gzip
+import random
+import collections
+import dataclasses
+import ctypes
+import ctypes.util
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Set, Any, Optional
+from typing import Callable, Dict, List, Set, Any, Optional, Tuple, Iterator
 from urllib.parse import urlparse, parse_qs
 
 try:
     import psutil
     import requests
     import websocket
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     print("Required dependencies not found. Installing...")
     subprocess.check_call([sys.executable, "-m", "pip", "install", "psutil", "requests", "websocket-client"])
     import psutil
     import requests
     import websocket
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+def _json_default(obj: Any) -> Any:
+    """Serialize the types orjson handles natively (dataclasses, datetimes) for stdlib json"""
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# orjson is optional; it serializes the per-tick payloads considerably faster
+try:
+    import orjson
+
+    def json_dumps(obj: Any) -> bytes:
+        """Serialize an object to compact JSON bytes"""
+        return orjson.dumps(obj)
+
+    def json_dumps_pretty(obj: Any) -> bytes:
+        """Serialize an object to indented JSON bytes, for files people may edit"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    json_loads = orjson.loads
+except ImportError:
+    orjson = None
+
+    def json_dumps(obj: Any) -> bytes:
+        """Serialize an object to compact JSON bytes"""
+        return json.dumps(obj, separators=(',', ':'), default=_json_default).encode('utf-8')
+
+    def json_dumps_pretty(obj: Any) -> bytes:
+        """Serialize an object to indented JSON bytes, for files people may edit"""
+        return json.dumps(obj, indent=2, default=_json_default).encode('utf-8')
+
+    json_loads = json.loads
+
+# pyahocorasick is optional; it matches restricted app names in a single pass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
 
 # Parse command line arguments
 parser = argparse.ArgumentParser(description="ActivTrack Desktop Agent")
@@ -50,25 +104,112 @@ log_dir = Path(os.path.expanduser("~/.activtrack"))
 log_dir.mkdir(exist_ok=True)
 log_file = log_dir / "agent.log"
 
+# delay=True avoids opening the log file until something is logged
+log_handlers = [
+    logging.handlers.RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=3, delay=True)
+]
+# Only echo to a console someone is watching. When started in the background,
+# stdout/stderr are redirected to a file (agent.out); logging there as well would
+# duplicate every record in a file that is never rotated.
+if sys.stderr is not None and sys.stderr.isatty():
+    log_handlers.append(logging.StreamHandler())
+
 logging.basicConfig(
     level=logging.DEBUG if args.debug else logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler()
-    ]
+    handlers=log_handlers
 )
 
 logger = logging.getLogger("ActivTrack-Agent")
 
 # Constants and defaults
-CONFIG_PATH = args.config_file if args.config_file else log_dir / "config.json"
+CONFIG_PATH = Path(args.config_file) if args.config_file else log_dir / "config.json"
 DEFAULT_API_ENDPOINT = "http://localhost:5000/api"
 DEFAULT_WS_ENDPOINT = "ws://localhost:5000/ws"
 ACTIVITY_CHECK_INTERVAL = 10  # Check running apps every 10 seconds
 SCREENSHOT_INTERVAL = 300  # Take screenshot every 5 minutes (300 seconds)
 RESTRICTED_APP_TIMEOUT = 120  # 2 minutes (in seconds)
+RESTRICTED_CHECK_MAX_INTERVAL = 60  # Slowest restricted-app scan rate on an unchanging system (seconds)
 HEARTBEAT_INTERVAL = 60  # Send heartbeat every 60 seconds
+MACHINE_INFO_TTL = 300  # Reuse collected machine info for 5 minutes
+CONFIG_SAVE_DELAY = 1.0  # Settings pushed within this window are saved in one write (seconds)
+AGENT_NICENESS = 10  # POSIX nice value the agent runs at, so it yields to the user's own work
+MEMORY_INFO_TTL = 2  # Share one virtual_memory() read between back-to-back callers (seconds)
+HEARTBEAT_MAX_SILENCE = 5 * HEARTBEAT_INTERVAL  # Heartbeat at least this often even when nothing changed
+HEARTBEAT_CPU_DELTA = 10.0  # Smoothed CPU change (percentage points) that is worth reporting
+HEARTBEAT_MEMORY_DELTA = 5.0  # Smoothed memory change (percentage points) that is worth reporting
+METRICS_EWMA_ALPHA = 0.3  # Weight of the newest sample in the smoothed metrics
+WS_RECONNECT_MAX_DELAY = 30  # Upper bound for the WebSocket reconnect backoff (seconds)
+ACTIVITY_MAX_COALESCE = 60  # Longest an unchanged activity is merged before it is sent anyway (seconds)
+ACTIVITY_BATCH_SIZE = 30  # Flush buffered activity samples once this many are waiting
+ACTIVITY_FLUSH_INTERVAL = 60  # ...or once the oldest has waited this long (seconds)
+EVENT_COALESCE_WINDOW = 1.0  # Wait this long after an event so a burst shares one upload (seconds)
+GZIP_MIN_BYTES = 1024  # HTTP bodies smaller than this aren't worth compressing
+SEND_BUFFER_SIZE = 360  # Activity samples held while the server is unreachable (1 hour at 10s)
+EVENT_BUFFER_SIZE = 1000  # Events held while the server is unreachable; the oldest are dropped beyond this
+HTTP_TIMEOUT = (3.05, 10)  # (connect, read) seconds; an unreachable server fails fast
+SCREENSHOT_TIMEOUT = (3.05, 30)  # Longer read timeout for image data
+SHUTDOWN_FLUSH_TIMEOUT = 15  # Longest shutdown waits for the sender's final upload (seconds)
+
+# Precompiled patterns used on every activity sample
+MAC_ADDRESS_RE = re.compile(r'([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})')
+URL_RE = re.compile(r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+')
+# Browser title patterns: "Page Title - Website Name" (Chrome, Firefox, etc.) or "Website Name: Page Title"
+BROWSER_TITLE_RE = re.compile(r'^.*\s-\s([\w\d]+\.\w+)$|^([\w\d]+\.\w+):.*$')
+
+# Host details that cannot change while the agent runs, looked up once at import
+HOSTNAME = platform.node()
+USERNAME = sys.intern(getpass.getuser())
+CPU_COUNT = psutil.cpu_count(logical=True)
+OS_TYPE = platform.system()
+OS_RELEASE = platform.release()
+OS_VERSION = platform.version()
+
+@dataclass
+class ProcessSnapshot:
+    """Cached details of a running process, replaced whenever a scan sees any of them change"""
+    __slots__ = ('pid', 'name', 'name_lower', 'exe_path', 'username', 'start_time')
+    
+    pid: int
+    name: str
+    name_lower: str
+    exe_path: Optional[str]  # None until first needed; the readlink is the costly lookup
+    username: Optional[str]
+    start_time: Optional[float]  # Epoch seconds
+
+class EventBuffer:
+    """Thread-safe, bounded event buffer that hands over everything pending in one locked swap"""
+    
+    def __init__(self, maxlen: int):
+        self._lock = threading.Lock()
+        self._events = collections.deque(maxlen=maxlen)
+        self.dropped = 0  # Events overwritten because the buffer was full, since startup
+    
+    def put(self, event: Dict[str, Any]) -> None:
+        """Add an event, overwriting the oldest one if the buffer is full"""
+        with self._lock:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+    
+    def drain(self) -> List[Dict[str, Any]]:
+        """Remove and return all pending events"""
+        with self._lock:
+            events, self._events = self._events, collections.deque(maxlen=self._events.maxlen)
+        return list(events)
+    
+    def requeue(self, events: List[Dict[str, Any]]) -> None:
+        """Put back events whose upload failed, ahead of any queued since, dropping the oldest if that overfills the buffer"""
+        with self._lock:
+            pending = self._events
+            overflow = len(events) + len(pending) - pending.maxlen
+            if overflow > 0:
+                self.dropped += overflow
+            self._events = collections.deque(events + list(pending), maxlen=pending.maxlen)
+    
+    def empty(self) -> bool:
+        """Whether no events are pending"""
+        return not self._events
 
 class DesktopAgent:
     """Cross-platform desktop monitoring agent for ActivTrack"""
@@ -79,24 +220,96 @@ class DesktopAgent:
         self.organization_id = args.org_id  # Set from command line args
         self.api_endpoint = args.api_url if args.api_url else DEFAULT_API_ENDPOINT
         self.ws_endpoint = args.ws_url if args.ws_url else DEFAULT_WS_ENDPOINT
-        self.username = getpass.getuser()
-        self.hostname = platform.node()
+        self.username = USERNAME
+        self.hostname = HOSTNAME
         self.running = True
+        self._stop_event = threading.Event()  # Set on shutdown to wake any waiting loop
         self.connected = False
         self.ws = None
         self.ws_thread = None
+        self._ws_attempts = 0  # Consecutive WebSocket connections that ended or failed
+        self.sender_thread = None
+        # Activity samples waiting for the sender thread; the oldest are dropped when full
+        self._send_buffer = collections.deque(maxlen=SEND_BUFFER_SIZE)
+        self._send_ready = threading.Event()
+        self._pending_activity = None  # Current sample, extended while the activity stays the same
+        self._last_flush = time.monotonic()
+        # One-off uploads (screenshots, heartbeats) run here so a slow one can't
+        # stall the scan loop or hold up the other
+        self._upload_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="activtrack-upload")
+        self._uploads_in_flight: Dict[str, Future] = {}
         self.restricted_apps = []
+        # (Aho-Corasick automaton or None, compiled alternation used when pyahocorasick
+        # isn't installed or None, lowercased process name -> restricted? memo) for
+        # restricted_apps. Replaced as a whole, since the WebSocket thread swaps it
+        # while the main thread matches against it.
+        self._restricted_matching: Tuple[Any, Optional[re.Pattern], Dict[str, bool]] = (None, None, {})
+        # Restricted-app scans back off while nothing changes and snap back on any change
+        self._restricted_check_interval = ACTIVITY_CHECK_INTERVAL
+        self._next_restricted_check = 0.0  # time.monotonic() deadline
         self.restricted_app_timers = {}
-        self.event_queue = queue.Queue()
+        self._pid_cache: Dict[int, ProcessSnapshot] = {}
+        self.event_queue = EventBuffer(EVENT_BUFFER_SIZE)
         self.needs_init = True
         self.screenshot_enabled = True
         self.activity_tracking_enabled = True
         self.idle_threshold = 300  # 5 minutes in seconds
+        self.jwt = None
+        self._machine_info_cache: Optional[Dict[str, Any]] = None
+        self._machine_info_ts = 0.0  # time.monotonic() when the cache was filled
+        self._memory_info = None  # Last psutil.virtual_memory() result
+        self._envelope: Optional[bytes] = None  # Serialized identity fields, see _json_envelope
+        self._envelope_key: Optional[Tuple[Any, Any]] = None  # (device_id, organization_id) it was built for
+        self._memory_info_ts = 0.0  # time.monotonic() when it was read
+        self._config_cache: Optional[Dict[str, Any]] = None  # Config as last read from or written to disk
+        self._save_timer: Optional[threading.Timer] = None  # Pending debounced save_config
+        self._save_lock = threading.Lock()
+        self._config_write_lock = threading.Lock()
+        self.applescript_quit_fallback = True  # macOS: try AppleScript quit if psutil cannot kill
+        self.ingest_supported = True  # Cleared if the server has no /ingest endpoint
+        self._last_successful_contact: Optional[float] = None  # time.monotonic() of the last register/heartbeat
+        self._heartbeat_pending: Optional[Dict[str, Any]] = None  # Status to send with the next ingest batch
+        self._metrics_ewma: Optional[Tuple[float, float]] = None  # Smoothed (cpu, memory) percentages
+        self._reported_status: Optional[Tuple[float, float, bool]] = None  # Smoothed values at the last heartbeat
+        
+        # Shared HTTP session so uploads reuse keep-alive (and TLS) connections. One
+        # pooled connection per thread that can post at once: two upload workers, the
+        # sender and the main loop. Failed uploads are already buffered and retried by
+        # the sender, so the adapter only retries failed connects, which never reached
+        # the server and are safe to repeat for a POST.
+        self.http = requests.Session()
+        self.http.headers.update(JSON_HEADERS)
+        retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.5)
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        
+        # Server push messages, by their 'event' field
+        self._ws_handlers = {
+            'restricted_apps_update': self._on_restricted_apps_update,
+            'config_update': self._on_config_update,
+            'take_screenshot_now': self._on_take_screenshot_now,
+            'terminate_application': self._on_terminate_application
+        }
         
         # Detect operating system
-        self.os_type = platform.system()
-        self.os_version = platform.version()
-        self.os_release = platform.release()
+        self.os_type = OS_TYPE
+        self.os_version = OS_VERSION
+        self.os_release = OS_RELEASE
+        
+        # Non-blocking cpu_percent() measures since the previous call, and the very
+        # first call has nothing to compare against and returns 0.0; prime it now so
+        # the first heartbeat reports real usage
+        psutil.cpu_percent(interval=None)
+        
+        self._lower_priority()
+        
+        # Bind the OS idle counter once; is_idle() then costs a single native call
+        try:
+            self._idle_probe = self._make_idle_probe()
+        except Exception as e:
+            logger.warning("Idle detection unavailable: %s", e)
+            self._idle_probe = None
         
         logger.info(f"Agent initializing on {self.os_type} {self.os_release} ({self.os_version})")
         logger.info(f"Device ID: {self.device_id}, Organization ID: {self.organization_id}")
@@ -113,7 +326,33 @@ class DesktopAgent:
     def handle_signal(self, sig, frame):
         """Handle termination signals"""
         logger.info(f"Received signal {sig}, shutting down...")
+        self.stop()
+    
+    def stop(self) -> None:
+        """Stop the agent and wake the main and WebSocket loops immediately"""
         self.running = False
+        self._stop_event.set()
+        self._send_ready.set()  # Wake the sender for its final flush
+        if self.ws:
+            self.ws.close()
+        self._upload_pool.shutdown(wait=False)
+        
+        # Don't lose settings that arrived just before shutdown
+        with self._save_lock:
+            timer, self._save_timer = self._save_timer, None
+        if timer is not None:
+            timer.cancel()
+            self.save_config()  # A no-op if the timer already saved
+    
+    def schedule_save_config(self) -> None:
+        """Save the configuration shortly, folding a burst of updates into one write"""
+        # Runs off the calling thread, so the WebSocket callback never waits on the disk
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(CONFIG_SAVE_DELAY, self.save_config)
+            self._save_timer.daemon = True
+            self._save_timer.start()
     
     def load_config(self) -> None:
         """Load configuration from config file"""
@@ -122,8 +361,10 @@ class DesktopAgent:
             return
         
         try:
-            with open(CONFIG_PATH, "r") as f:
-                config = json.load(f)
+            with open(CONFIG_PATH, "rb") as f:
+                config = json_loads(f.read())
+            # Kept so save_config can skip rewriting an identical config
+            self._config_cache = config
             
             # Only use device_id from file if not already set
             if not self.device_id and 'device_id' in config:
@@ -141,6 +382,10 @@ class DesktopAgent:
             if not args.ws_url and 'ws_endpoint' in config:
                 self.ws_endpoint = config.get("ws_endpoint")
             
+            if config.get('jwt'):
+                self.jwt = config['jwt']
+                self.http.headers['Authorization'] = f"Bearer {self.jwt}"
+            
             # Load settings
             if 'screenshot_enabled' in config:
                 self.screenshot_enabled = config.get("screenshot_enabled", True)
@@ -152,7 +397,10 @@ class DesktopAgent:
                 self.idle_threshold = config.get("idle_threshold", 300)
             
             if 'restricted_apps' in config:
-                self.restricted_apps = config.get("restricted_apps", [])
+                self.set_restricted_apps(config.get("restricted_apps", []))
+            
+            if 'applescript_quit_fallback' in config:
+                self.applescript_quit_fallback = config.get("applescript_quit_fallback", True)
             
             logger.info(f"Loaded configuration: device_id={self.device_id}, organization_id={self.organization_id}")
             logger.info(f"Settings: screenshot_enabled={self.screenshot_enabled}, activity_tracking_enabled={self.activity_tracking_enabled}")
@@ -171,11 +419,31 @@ class DesktopAgent:
                 'screenshot_enabled': self.screenshot_enabled,
                 'activity_tracking_enabled': self.activity_tracking_enabled,
                 'idle_threshold': self.idle_threshold,
-                'restricted_apps': self.restricted_apps
+                'restricted_apps': self.restricted_apps,
+                'applescript_quit_fallback': self.applescript_quit_fallback
             }
             
-            with open(CONFIG_PATH, "w") as f:
-                json.dump(config, f, indent=2)
+            # Keep the token written by the installer
+            if self.jwt:
+                config['jwt'] = self.jwt
+            
+            # The debounced save runs on a timer thread; never let two writes share the temp file
+            with self._config_write_lock:
+                if config == self._config_cache:
+                    logger.debug("Configuration unchanged, skipping save")
+                    return
+                
+                config_bytes = json_dumps_pretty(config)
+                
+                # Write to a temporary file and swap it in so a crash can't leave a truncated config
+                tmp_path = CONFIG_PATH.with_suffix(CONFIG_PATH.suffix + ".tmp")
+                with open(tmp_path, "wb") as f:
+                    f.write(config_bytes)
+                    # Make sure the new contents are on disk before the rename makes them live
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, CONFIG_PATH)
+                self._config_cache = config
             
             logger.info("Configuration saved successfully")
         except Exception as e:
@@ -183,28 +451,34 @@ class DesktopAgent:
     
     def get_machine_info(self) -> Dict[str, Any]:
         """Get detailed machine information"""
-        try:
-            # Basic system info
-            info = {
-                'hostname': self.hostname,
-                'username': self.username,
-                'os_type': self.os_type,
-                'os_version': f"{self.os_release} ({self.os_version})",
-                'cpu_cores': psutil.cpu_count(logical=True),
-                'memory_total': psutil.virtual_memory().total,
-                'disk_total': {path.mountpoint: path.total for path in psutil.disk_partitions() if path.fstype},
-                'mac_address': self._get_mac_address(),
-                'ip_address': self._get_ip_address()
-            }
-            return info
-        except Exception as e:
-            logger.error(f"Error getting machine info: {e}")
-            return {
-                'hostname': self.hostname,
-                'username': self.username,
-                'os_type': self.os_type,
-                'os_version': f"{self.os_release} ({self.os_version})"
-            }
+        # Hostname, username and OS never change while the agent runs
+        info = {
+            'hostname': self.hostname,
+            'username': self.username,
+            'os_type': self.os_type,
+            'os_version': f"{self.os_release} ({self.os_version})"
+        }
+        
+        # The hardware and network details are expensive to collect (disk and
+        # interface enumeration) but effectively static, so cache them
+        if self._machine_info_cache is None or time.monotonic() - self._machine_info_ts >= MACHINE_INFO_TTL:
+            try:
+                self._machine_info_cache = {
+                    'cpu_cores': CPU_COUNT,
+                    'memory_total': self._get_memory_info().total,
+                    'disk_total': {path.mountpoint: path.total for path in psutil.disk_partitions() if path.fstype},
+                    'mac_address': self._get_mac_address(),
+                    'ip_address': self._get_ip_address()
+                }
+                self._machine_info_ts = time.monotonic()
+            except Exception as e:
+                logger.error(f"Error getting machine info: {e}")
+                if self._machine_info_cache is None:
+                    return info
+                # Otherwise fall back to the last good (stale) values
+        
+        info.update(self._machine_info_cache)
+        return info
     
     def _get_mac_address(self) -> str:
         """Get MAC address of default network interface"""
@@ -213,14 +487,14 @@ class DesktopAgent:
                 # Windows approach
                 for interface_name, interface_addresses in psutil.net_if_addrs().items():
                     for address in interface_addresses:
-                        if re.match(r'([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})', str(address.address)):
+                        if MAC_ADDRESS_RE.match(str(address.address)):
                             return address.address
             else:
                 # Unix-like approach
                 for interface_name, interface_addresses in psutil.net_if_addrs().items():
                     if interface_name != 'lo':  # Skip loopback
                         for address in interface_addresses:
-                            if re.match(r'([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})', str(address.address)):
+                            if MAC_ADDRESS_RE.match(str(address.address)):
                                 return address.address
             return "unknown"
         except Exception as e:
@@ -230,34 +504,135 @@ class DesktopAgent:
     def _get_ip_address(self) -> str:
         """Get IP address of the machine"""
         try:
-            # Get address of the interface connected to the outside world
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            ip = s.getsockname()[0]
-            s.close()
-            return ip
-        except:
-            # Fallback method
-            for interface_name, interface_addresses in psutil.net_if_addrs().items():
+            addresses = psutil.net_if_addrs()
+            
+            # Prefer the interface carrying the default route (Linux exposes it locally,
+            # so no packet has to be sent to find it)
+            default_iface = self._get_default_route_interface()
+            if default_iface:
+                for address in addresses.get(default_iface, []):
+                    if address.family == socket.AF_INET:
+                        return address.address
+            
+            # Otherwise take the first IPv4 address on an interface that is up
+            stats = psutil.net_if_stats()
+            for interface_name, interface_addresses in addresses.items():
+                if interface_name in stats and not stats[interface_name].isup:
+                    continue
                 for address in interface_addresses:
-                    if address.family == socket.AF_INET and address.address != '127.0.0.1':
+                    if (address.family == socket.AF_INET
+                            and not address.address.startswith('127.')
+                            and not address.address.startswith('169.254.')):
                         return address.address
             return "unknown"
+        except Exception as e:
+            logger.error("Error getting IP address: %s", e)
+            return "unknown"
+    
+    def _get_default_route_interface(self) -> Optional[str]:
+        """Get the name of the interface with the default IPv4 route, where the OS exposes it"""
+        if self.os_type != 'Linux':
+            return None
+        
+        try:
+            with open('/proc/net/route') as f:
+                next(f)  # Header: Iface Destination Gateway Flags ...
+                for line in f:
+                    fields = line.split()
+                    if len(fields) > 1 and fields[1] == '00000000':
+                        return fields[0]
+        except (OSError, StopIteration):
+            pass
+        return None
+    
+    def _lower_priority(self) -> None:
+        """Run the agent below normal CPU and I/O priority so it never competes with the user"""
+        proc = psutil.Process()
+        try:
+            if self.os_type == 'Windows':
+                proc.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+            else:
+                proc.nice(AGENT_NICENESS)
+        except (psutil.Error, OSError) as e:
+            logger.debug("Could not lower CPU priority: %s", e)
+        
+        # Background uploads and config writes shouldn't delay the user's disk I/O
+        try:
+            if self.os_type == 'Linux':
+                proc.ionice(psutil.IOPRIO_CLASS_IDLE)
+            elif self.os_type == 'Windows':
+                proc.ionice(psutil.IOPRIO_LOW)
+        except (psutil.Error, OSError, AttributeError) as e:
+            logger.debug("Could not lower I/O priority: %s", e)
+    
+    def _make_idle_probe(self) -> Optional[Callable[[], float]]:
+        """Build a function returning the seconds since the last keyboard/mouse input, read from the OS"""
+        if self.os_type == 'Windows':
+            class LASTINPUTINFO(ctypes.Structure):
+                _fields_ = [('cbSize', ctypes.c_uint), ('dwTime', ctypes.c_uint32)]
+            
+            user32 = ctypes.windll.user32
+            get_tick_count = ctypes.windll.kernel32.GetTickCount
+            get_tick_count.restype = ctypes.c_uint32
+            last_input = LASTINPUTINFO(ctypes.sizeof(LASTINPUTINFO), 0)
+            
+            def probe() -> float:
+                if not user32.GetLastInputInfo(ctypes.byref(last_input)):
+                    raise ctypes.WinError()
+                # Both are 32-bit millisecond tick counts; mask so the wrap after 49 days is harmless
+                return ((get_tick_count() - last_input.dwTime) & 0xFFFFFFFF) / 1000.0
+            return probe
+        
+        elif self.os_type == 'Darwin':  # macOS
+            core_graphics = ctypes.cdll.LoadLibrary('/System/Library/Frameworks/CoreGraphics.framework/CoreGraphics')
+            seconds_since = core_graphics.CGEventSourceSecondsSinceLastEventType
+            seconds_since.restype = ctypes.c_double
+            seconds_since.argtypes = [ctypes.c_int32, ctypes.c_uint32]
+            
+            # kCGEventSourceStateCombinedSessionState, kCGAnyInputEventType
+            return lambda: seconds_since(0, 0xFFFFFFFF)
+        
+        else:  # Linux
+            # The X screensaver extension keeps the idle time (what xprintidle reads);
+            # without an X display (headless, pure Wayland) idle detection is skipped
+            x11_path = ctypes.util.find_library('X11')
+            xss_path = ctypes.util.find_library('Xss')
+            if not x11_path or not xss_path or not os.environ.get('DISPLAY'):
+                return None
+            
+            class XScreenSaverInfo(ctypes.Structure):
+                _fields_ = [('window', ctypes.c_ulong), ('state', ctypes.c_int), ('kind', ctypes.c_int),
+                            ('til_or_since', ctypes.c_ulong), ('idle', ctypes.c_ulong),
+                            ('eventMask', ctypes.c_ulong)]
+            
+            x11 = ctypes.cdll.LoadLibrary(x11_path)
+            xss = ctypes.cdll.LoadLibrary(xss_path)
+            x11.XOpenDisplay.restype = ctypes.c_void_p
+            x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+            x11.XDefaultRootWindow.restype = ctypes.c_ulong
+            x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+            xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(XScreenSaverInfo)
+            xss.XScreenSaverQueryInfo.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XScreenSaverInfo)]
+            
+            display = x11.XOpenDisplay(None)
+            if not display:
+                return None
+            root = x11.XDefaultRootWindow(display)
+            info = xss.XScreenSaverAllocInfo()
+            
+            def probe() -> float:
+                if not xss.XScreenSaverQueryInfo(display, root, info):
+                    raise OSError("XScreenSaverQueryInfo failed")
+                return info.contents.idle / 1000.0
+            return probe
     
     def is_idle(self) -> bool:
         """Check if the system is idle based on user activity"""
+        if self._idle_probe is None:
+            return False
+        
         try:
-            # Different implementation based on OS
-            if self.os_type == 'Windows':
-                # Windows-specific idle detection would go here
-                # For now we'll use a simplified approach
-                return False
-            elif self.os_type == 'Darwin':  # macOS
-                # macOS-specific idle detection would go here
-                return False
-            else:  # Linux
-                # Linux-specific idle detection would go here
-                return False
+            return self._idle_probe() >= self.idle_threshold
         except Exception as e:
             logger.error(f"Error checking idle state: {e}")
             return False
@@ -279,57 +654,60 @@ class DesktopAgent:
             logger.error(f"Error getting active window: {e}")
             return {'title': 'Unknown', 'application': 'Unknown'}
     
-    def get_running_applications(self) -> List[Dict[str, Any]]:
-        """Get list of currently running applications/processes"""
-        running_apps = []
+    def refresh_process_cache(self) -> Tuple[List[int], List[int]]:
+        """Rescan processes into the PID cache and return the user's (new_pids, ended_pids)"""
+        # Every scan reads each process's name, username and create_time (on Linux its
+        # /proc/<pid>/stat and status files; process_iter reuses its Process objects
+        # between calls). Diffing PIDs alone would be cheaper but goes stale: a launcher
+        # that execs the real program (google-chrome -> chrome, steam.sh -> steam)
+        # keeps its PID and only changes its name. An entry counts as new when its
+        # PID, name or create_time wasn't seen before.
+        previous = self._pid_cache
+        cache: Dict[int, ProcessSnapshot] = {}
+        new_pids = []
         
-        try:
-            for proc in psutil.process_iter(['pid', 'name', 'exe', 'username', 'create_time']):
-                try:
-                    # Skip system processes
-                    if proc.info['username'] != self.username:
-                        continue
-                    
-                    # Basic process info
-                    proc_info = {
-                        'pid': proc.info['pid'],
-                        'name': proc.info['name'],
-                        'exe_path': proc.info['exe'] if proc.info['exe'] else "",
-                        'username': proc.info['username'],
-                        'start_time': datetime.datetime.fromtimestamp(proc.info['create_time']).isoformat(),
-                    }
-                    
-                    # Try to get additional details based on platform
-                    if self.os_type == 'Windows':
-                        try:
-                            proc_info['window_title'] = self._get_window_title_windows(proc.info['pid'])
-                        except:
-                            proc_info['window_title'] = ""
-                    elif self.os_type == 'Darwin':  # macOS
-                        try:
-                            proc_info['window_title'] = self._get_window_title_macos(proc.info['name'])
-                        except:
-                            proc_info['window_title'] = ""
-                    
-                    running_apps.append(proc_info)
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-        except Exception as e:
-            logger.error(f"Error getting running applications: {e}")
+        for proc in psutil.process_iter(['name', 'username', 'create_time']):
+            info = proc.info
+            pid = proc.pid
+            name = info['name'] or ""
+            username = info['username']  # None if access was denied
+            if username is not None:
+                # Interned so every cached process of a user shares one string
+                username = sys.intern(username)
+            
+            snapshot = previous.get(pid)
+            if (snapshot is None or snapshot.name != name or snapshot.username != username
+                    or snapshot.start_time != info['create_time']):
+                # The exe readlink is left to _get_exe_path, which only runs for
+                # processes that are actually reported
+                snapshot = ProcessSnapshot(pid, name, name.lower(), None, username, info['create_time'])
+                if username == self.username:
+                    new_pids.append(pid)
+            cache[pid] = snapshot
         
-        return running_apps
+        ended_pids = [pid for pid, snapshot in previous.items()
+                      if snapshot.username == self.username and cache.get(pid) is not snapshot]
+        self._pid_cache = cache
+        return new_pids, ended_pids
     
-    def _get_window_title_windows(self, pid: int) -> str:
-        """Get window title for Windows processes"""
-        # This would require Windows-specific libraries like pywin32
-        # For now, we'll return empty string as a placeholder
-        return ""
+    def _get_exe_path(self, pid: int) -> str:
+        """Get a cached process's executable path, looking it up on first use"""
+        snapshot = self._pid_cache.get(pid)
+        if snapshot is None:
+            return ""
+        
+        if snapshot.exe_path is None:
+            try:
+                snapshot.exe_path = psutil.Process(pid).exe() or ""
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                snapshot.exe_path = ""
+        return snapshot.exe_path
     
-    def _get_window_title_macos(self, app_name: str) -> str:
-        """Get window title for macOS processes"""
-        # This would require macOS-specific approach, potentially using AppleScript
-        # For now, we'll return empty string as a placeholder
-        return ""
+    def iter_user_processes(self) -> Iterator[ProcessSnapshot]:
+        """Yield cached snapshots of the current user's processes"""
+        for snapshot in self._pid_cache.values():
+            if snapshot.username == self.username:
+                yield snapshot
     
     def take_screenshot(self) -> Optional[Dict[str, Any]]:
         """Take a screenshot of the current display"""
@@ -338,13 +716,13 @@ class DesktopAgent:
             return None
         
         try:
-            # This would implement actual screenshot functionality using platform-specific methods
-            # For now, we'll simulate it with placeholder data
+            # Read the window first so the metadata matches what was on screen
             active_window = self.get_active_window()
+            timestamp = datetime.datetime.now().isoformat()
             
             screenshot_data = {
-                'timestamp': datetime.datetime.now().isoformat(),
-                'imageData': "base64_encoded_image_data_would_be_here",  # Placeholder
+                'timestamp': timestamp,
+                'image': self._capture_image(),
                 'title': active_window['title'],
                 'application': active_window['application']
             }
@@ -355,79 +733,147 @@ class DesktopAgent:
             logger.error(f"Error taking screenshot: {e}")
             return None
     
+    def _capture_image(self) -> bytes:
+        """Grab the display and return it as raw PNG bytes"""
+        # This would implement actual screenshot functionality using platform-specific methods
+        # (grab, PNG-encode into a BytesIO). It is CPU-heavy, which is why screenshots are
+        # only taken from the upload pool. The bytes are uploaded as-is, with no base64 step.
+        # For now, return placeholder data
+        return b"png_image_data_would_be_here"
+    
+    def capture_and_send_screenshot(self) -> bool:
+        """Take a screenshot and upload it; meant to run in the upload pool"""
+        screenshot_data = self.take_screenshot()
+        if not screenshot_data:
+            return False
+        return self.send_screenshot(screenshot_data)
+    
     def terminate_process(self, pid: int, name: str) -> bool:
         """Terminate a process based on its PID"""
         logger.info(f"Attempting to terminate restricted application: {name} (PID: {pid})")
         
         try:
-            if self.os_type == 'Windows':
-                # Windows process termination
-                subprocess.run(['taskkill', '/F', '/PID', str(pid)], check=True)
-                return True
-            elif self.os_type == 'Darwin':  # macOS
-                # Try normal termination first
-                try:
-                    process = psutil.Process(pid)
-                    process.terminate()
-                    process.wait(timeout=3)
-                    return True
-                except (psutil.NoSuchProcess, psutil.TimeoutExpired):
-                    # If normal termination fails, try AppleScript for graceful quit
-                    osascript = f'tell application "{name}" to quit'
-                    subprocess.run(['osascript', '-e', osascript], check=True)
-                    return True
-            else:  # Linux and others
-                process = psutil.Process(pid)
-                process.terminate()
+            # Ask nicely first, then force; psutil does both in-process on every OS
+            process = psutil.Process(pid)
+            process.terminate()
+            try:
                 process.wait(timeout=3)
-                return True
+            except psutil.TimeoutExpired:
+                process.kill()
+                process.wait(timeout=3)
+            return True
         except Exception as e:
             logger.error(f"Failed to terminate process {name} (PID: {pid}): {e}")
-            return False
+        
+        if self.os_type == 'Darwin' and self.applescript_quit_fallback:
+            # Last resort: ask the application to quit through AppleScript
+            try:
+                osascript = f'tell application "{name}" to quit'
+                subprocess.run(['osascript', '-e', osascript], check=True)
+                return True
+            except Exception as e:
+                logger.error("Failed to quit %s via AppleScript: %s", name, e)
+        
+        return False
+    
+    def set_restricted_apps(self, restricted_apps: List[str]) -> None:
+        """Replace the restricted app list and rebuild the name matcher"""
+        # Empty entries would match every process name, so they are ignored
+        names = list(dict.fromkeys(name.lower() for name in restricted_apps if name))
+        
+        matcher = None
+        pattern = None
+        if names and ahocorasick is not None:
+            matcher = ahocorasick.Automaton()
+            for name in names:
+                matcher.add_word(name, name)
+            matcher.make_automaton()
+        elif names:
+            # A single alternation keeps the scan inside the C regex engine
+            pattern = re.compile('|'.join(map(re.escape, names)))
+        
+        # Built aside and swapped in with one assignment: a scan running meanwhile
+        # sees either the old list or the new one, and its verdicts land in the memo
+        # that belongs to the list they were made against
+        self._restricted_matching = (matcher, pattern, {})
+        self.restricted_apps = restricted_apps
+        
+        # Enforce the new list on the next tick
+        self._restricted_check_interval = ACTIVITY_CHECK_INTERVAL
+        self._next_restricted_check = 0.0
     
-    def check_restricted_apps(self) -> None:
-        """Check for restricted applications and enforce policies"""
+    def _is_restricted(self, app_name: str) -> bool:
+        """Check whether a lowercased process name contains any restricted app name"""
+        matcher, pattern, verdicts = self._restricted_matching
+        
+        # Most names recur on every scan, so remember each verdict until the list changes
+        verdict = verdicts.get(app_name)
+        if verdict is not None:
+            return verdict
+        
+        if matcher is not None:
+            verdict = next(matcher.iter(app_name), None) is not None
+        elif pattern is not None:
+            verdict = pattern.search(app_name) is not None
+        else:
+            verdict = False
+        
+        verdicts[app_name] = verdict
+        return verdict
+    
+    def check_restricted_apps(self) -> bool:
+        """Check for restricted applications and enforce policies; returns True if anything changed or is pending"""
         if not self.restricted_apps:
-            return
+            return False
+        
+        try:
+            new_pids, ended_pids = self.refresh_process_cache()
+        except Exception as e:
+            logger.error("Error scanning processes: %s", e)
+            return True
+        
+        changed = bool(new_pids or ended_pids)
         
-        running_apps = self.get_running_applications()
-        current_time = time.time()
+        # Walk the PID cache directly; the full per-app dicts are not needed here
+        candidates = [(snapshot.pid, snapshot.name_lower) for snapshot in self.iter_user_processes()]
+        
+        # Timers run on the monotonic clock so a wall-clock jump can't end or extend them
+        # early; a wall-clock timestamp is only made for the rare pass that emits an event
+        current_time = time.monotonic()
         
         # Set of currently running restricted apps
         running_restricted_apps = set()
         
-        for app in running_apps:
-            app_name = app['name'].lower()
-            
+        for pid, app_name in candidates:
             # Check if this app is in the restricted list
-            for restricted_app in self.restricted_apps:
-                restricted_name = restricted_app.lower()
+            if not self._is_restricted(app_name):
+                continue
+            
+            key = f"{pid}:{app_name}"
+            running_restricted_apps.add(key)
+            
+            # If we haven't started a timer for this instance, start one
+            if key not in self.restricted_app_timers:
+                logger.warning("Restricted application detected: %s (PID: %d)", app_name, pid)
+                self.restricted_app_timers[key] = {
+                    'start_time': current_time,
+                    'pid': pid,
+                    'name': app_name,
+                    'warned': False
+                }
                 
-                if restricted_name in app_name:
-                    pid = app['pid']
-                    key = f"{pid}:{app_name}"
-                    running_restricted_apps.add(key)
-                    
-                    # If we haven't started a timer for this instance, start one
-                    if key not in self.restricted_app_timers:
-                        logger.warning(f"Restricted application detected: {app_name} (PID: {pid})")
-                        self.restricted_app_timers[key] = {
-                            'start_time': current_time,
-                            'pid': pid,
-                            'name': app_name,
-                            'warned': False
-                        }
-                        
-                        # Log the event
-                        self.event_queue.put({
-                            'event': 'restricted_app_detected',
-                            'app_name': app_name,
-                            'pid': pid,
-                            'timestamp': datetime.datetime.now().isoformat()
-                        })
-        
-        # Check timers and terminate if needed
+                # Log the event
+                self.queue_event({
+                    'event': 'restricted_app_detected',
+                    'app_name': app_name,
+                    'pid': pid,
+                    'exe_path': self._get_exe_path(pid),
+                    'timestamp': datetime.datetime.now()
+                })
+        
+        # Check timers and collect the ones due for termination
         keys_to_remove = []
+        expired = []
         for key, timer_info in self.restricted_app_timers.items():
             # If the process is no longer running or no longer restricted, remove the timer
             if key not in running_restricted_apps:
@@ -438,7 +884,7 @@ class DesktopAgent:
             
             # Warning at 1 minute
             if elapsed_time >= 60 and not timer_info['warned']:
-                logger.warning(f"Restricted app warning: {timer_info['name']} running for 1 minute")
+                logger.warning("Restricted app warning: %s running for 1 minute", timer_info['name'])
                 timer_info['warned'] = True
                 
                 # Show warning notification to user
@@ -446,25 +892,53 @@ class DesktopAgent:
             
             # Terminate after timeout (2 minutes)
             if elapsed_time >= RESTRICTED_APP_TIMEOUT:
-                if self.terminate_process(timer_info['pid'], timer_info['name']):
-                    logger.info(f"Terminated restricted app: {timer_info['name']} after {elapsed_time:.1f} seconds")
-                    
-                    # Show termination notification to user
-                    self._show_termination_notification(timer_info['name'])
-                    
-                    # Log the termination event
-                    self.event_queue.put({
-                        'event': 'restricted_app_terminated',
-                        'app_name': timer_info['name'],
-                        'pid': timer_info['pid'],
-                        'timestamp': datetime.datetime.now().isoformat()
-                    })
-                    
-                    keys_to_remove.append(key)
+                expired.append((key, timer_info, elapsed_time))
+        
+        for (key, timer_info, elapsed_time), terminated in zip(expired, self._terminate_all(expired)):
+            if terminated:
+                logger.info("Terminated restricted app: %s after %.1f seconds", timer_info['name'], elapsed_time)
+                
+                # Show termination notification to user
+                self._show_termination_notification(timer_info['name'])
+                
+                # Log the termination event
+                self.queue_event({
+                    'event': 'restricted_app_terminated',
+                    'app_name': timer_info['name'],
+                    'pid': timer_info['pid'],
+                    'timestamp': datetime.datetime.now()
+                })
+                
+                keys_to_remove.append(key)
         
         # Remove processed timers
         for key in keys_to_remove:
             self.restricted_app_timers.pop(key, None)
+        
+        return changed or bool(self.restricted_app_timers)
+    
+    def _terminate_all(self, expired: List[Tuple[str, Dict[str, Any], float]]) -> List[bool]:
+        """Terminate expired restricted apps, in parallel when there are several"""
+        if len(expired) <= 1:
+            return [self.terminate_process(info['pid'], info['name']) for _, info, _ in expired]
+        
+        # Each termination can block for up to two 3s waits, so run them side by side and
+        # bound the pass by the slowest one rather than the sum
+        with ThreadPoolExecutor(max_workers=len(expired), thread_name_prefix="activtrack-terminate") as pool:
+            return list(pool.map(lambda item: self.terminate_process(item[1]['pid'], item[1]['name']), expired))
+    
+    def _maybe_check_restricted_apps(self) -> None:
+        """Run check_restricted_apps when due, stretching the interval by 1.5x while nothing changes"""
+        now = time.monotonic()
+        if now < self._next_restricted_check:
+            return
+        
+        if self.check_restricted_apps():
+            self._restricted_check_interval = ACTIVITY_CHECK_INTERVAL
+        else:
+            self._restricted_check_interval = min(RESTRICTED_CHECK_MAX_INTERVAL, self._restricted_check_interval * 1.5)
+        
+        self._next_restricted_check = now + self._restricted_check_interval
     
     def _show_restriction_warning(self, app_name: str) -> None:
         """Display a warning to the user about restricted application"""
@@ -530,9 +1004,12 @@ class DesktopAgent:
             active_window = self.get_active_window()
             is_idle = self.is_idle()
             
+            # Kept as a datetime; the encoder writes it out as ISO 8601
+            now = datetime.datetime.now()
+            
             activity_data = {
-                'startTime': datetime.datetime.now().isoformat(),
-                'endTime': datetime.datetime.now().isoformat(),  # Will be updated later
+                'startTime': now,
+                'endTime': now,  # Will be updated later
                 'application': active_window['application'],
                 'title': active_window['title'],
                 'website': self._extract_website_from_title(active_window['title']),
@@ -542,32 +1019,33 @@ class DesktopAgent:
             
             return activity_data
         except Exception as e:
-            logger.error(f"Error tracking activity: {e}")
+            logger.error("Error tracking activity: %s", e)
             return None
     
     def _extract_website_from_title(self, title: str) -> Optional[str]:
         """Extract website URL from window title if present"""
         # Simple regex to find URLs in window titles
-        url_pattern = r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+'
-        match = re.search(url_pattern, title)
+        match = URL_RE.search(title)
         if match:
             return match.group(0)
         
         # Check for common browser patterns
-        browser_patterns = [
-            # Chrome, Firefox, etc. pattern: "Page Title - Website Name"
-            r'^.*\s-\s([\w\d]+\.\w+)$',
-            # Another pattern: "Website Name: Page Title"
-            r'^([\w\d]+\.\w+):.*$'
-        ]
-        
-        for pattern in browser_patterns:
-            match = re.search(pattern, title)
-            if match:
-                return match.group(1)
+        match = BROWSER_TITLE_RE.search(title)
+        if match:
+            return match.group(1) or match.group(2)
         
         return None
     
+    def _encode_payload(self, data: Dict[str, Any], compress: bool = False) -> Tuple[bytes, Dict[str, str]]:
+        """Encode an upload payload as JSON, gzipping larger bodies if requested"""
+        body, headers = json_dumps(data), JSON_HEADERS
+        
+        if compress and len(body) >= GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=1)  # Most of the gain on JSON, at a fraction of the CPU
+            headers = {**headers, 'Content-Encoding': 'gzip'}
+        
+        return body, headers
+    
     def register_with_server(self) -> bool:
         """Register this agent with the server and obtain necessary credentials"""
         if not self.organization_id:
@@ -590,12 +1068,12 @@ class DesktopAgent:
             }
             
             logger.info(f"Registering with server: {self.api_endpoint}/agent-register")
-            logger.debug(f"Registration data: {data}")
+            logger.debug("Registration data: %s", data)
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.api_endpoint}/agent-register",
-                json=data,
-                timeout=10
+                data=json_dumps(data),
+                timeout=HTTP_TIMEOUT
             )
             
             if response.status_code == 200 or response.status_code == 201:
@@ -616,13 +1094,16 @@ class DesktopAgent:
                         self.idle_threshold = settings['idle_threshold']
                     
                     if 'restricted_apps' in settings:
-                        self.restricted_apps = settings['restricted_apps']
+                        self.set_restricted_apps(settings['restricted_apps'])
                     
                     logger.info("Received and applied server settings")
                 
                 # Save updated configuration
                 self.save_config()
                 
+                # Registration tells the server the agent is alive, just like a heartbeat
+                self._last_successful_contact = time.monotonic()
+                
                 logger.info("Agent registered successfully with server")
                 return True
             else:
@@ -644,14 +1125,16 @@ class DesktopAgent:
                 'device_id': self.device_id,
                 'organization_id': self.organization_id,
                 'username': self.username,
-                'timestamp': datetime.datetime.now().isoformat(),
+                'timestamp': datetime.datetime.now(),
                 'activity': activity_data
             }
             
-            response = requests.post(
+            body, headers = self._encode_payload(data, compress=True)
+            response = self.http.post(
                 f"{self.api_endpoint}/activity",
-                json=data,
-                timeout=10
+                data=body,
+                headers=headers,
+                timeout=HTTP_TIMEOUT
             )
             
             if response.status_code == 200 or response.status_code == 201:
@@ -672,18 +1155,25 @@ class DesktopAgent:
             return False
         
         try:
+            # Send the image as a raw file part and everything else as form fields,
+            # instead of base64 inside JSON (a third larger, plus an extra string copy)
+            metadata = {k: v for k, v in screenshot_data.items() if k != 'image'}
             data = {
                 'device_id': self.device_id,
                 'organization_id': self.organization_id,
                 'username': self.username,
-                'timestamp': datetime.datetime.now().isoformat(),
-                'screenshot': screenshot_data
+                'timestamp': datetime.datetime.now().isoformat(),  # Plain form field, so formatted here
+                'metadata': json_dumps(metadata)
             }
+            files = {'image': ('screenshot.png', screenshot_data['image'], 'image/png')}
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.api_endpoint}/screenshot",
-                json=data,
-                timeout=30  # Longer timeout for image data
+                data=data,
+                files=files,
+                # Drop the session's JSON content type so requests sets the multipart boundary
+                headers={'Content-Type': None},
+                timeout=SCREENSHOT_TIMEOUT
             )
             
             if response.status_code == 200 or response.status_code == 201:
@@ -697,35 +1187,90 @@ class DesktopAgent:
             logger.error(f"Error sending screenshot: {e}")
             return False
     
-    def send_heartbeat(self) -> bool:
+    def _get_memory_info(self):
+        """Get psutil.virtual_memory(), reusing a read from the last couple of seconds"""
+        now = time.monotonic()
+        if self._memory_info is None or now - self._memory_info_ts >= MEMORY_INFO_TTL:
+            self._memory_info = psutil.virtual_memory()
+            self._memory_info_ts = now
+        return self._memory_info
+    
+    def _get_status(self) -> Dict[str, Any]:
+        """Get the system metrics reported with each heartbeat"""
+        return {
+            'cpu_usage': psutil.cpu_percent(interval=None),
+            'memory_usage': self._get_memory_info().percent,
+            'is_idle': self.is_idle()
+        }
+    
+    def request_heartbeat(self) -> None:
+        """Send a heartbeat if the metrics changed noticeably, or if the server hasn't heard from us in a while"""
+        status = self._get_status()
+        
+        # Smooth CPU and memory so ordinary jitter never counts as a change
+        cpu, memory = status['cpu_usage'], status['memory_usage']
+        if self._metrics_ewma is not None:
+            cpu = METRICS_EWMA_ALPHA * cpu + (1 - METRICS_EWMA_ALPHA) * self._metrics_ewma[0]
+            memory = METRICS_EWMA_ALPHA * memory + (1 - METRICS_EWMA_ALPHA) * self._metrics_ewma[1]
+        self._metrics_ewma = (cpu, memory)
+        
+        last = self._reported_status
+        silent_for = time.monotonic() - (self._last_successful_contact or float('-inf'))
+        if (last is not None
+                and silent_for < HEARTBEAT_MAX_SILENCE
+                and status['is_idle'] == last[2]
+                and abs(cpu - last[0]) < HEARTBEAT_CPU_DELTA
+                and abs(memory - last[1]) < HEARTBEAT_MEMORY_DELTA):
+            logger.debug("Metrics unchanged, skipping heartbeat")
+            return
+        
+        self._reported_status = (cpu, memory, status['is_idle'])
+        
+        # Fold the heartbeat into the next ingest batch when the server supports it
+        if self.ingest_supported:
+            self._heartbeat_pending = status
+            self._send_ready.set()
+        else:
+            self.submit_upload('heartbeat', self.send_heartbeat, status)
+    
+    def _json_envelope(self) -> bytes:
+        """Get the device/organization/user fields as an unterminated JSON object, serialized once"""
+        # Only registration or a config update can change the IDs; the username is constant
+        key = (self.device_id, self.organization_id)
+        if self._envelope_key != key:
+            self._envelope = json_dumps({
+                'device_id': self.device_id,
+                'organization_id': self.organization_id,
+                'username': self.username
+            })[:-1]
+            self._envelope_key = key
+        return self._envelope
+    
+    def send_heartbeat(self, status: Optional[Dict[str, Any]] = None) -> bool:
         """Send heartbeat to the server to indicate agent is running"""
         if not self.organization_id:
             logger.error("Cannot send heartbeat: Missing organization ID")
             return False
         
         try:
-            # Get system metrics
-            cpu_percent = psutil.cpu_percent(interval=None)
-            memory_info = psutil.virtual_memory()
-            
             data = {
-                'device_id': self.device_id,
-                'organization_id': self.organization_id,
-                'username': self.username,
-                'timestamp': datetime.datetime.now().isoformat(),
-                'cpu_usage': cpu_percent,
-                'memory_usage': memory_info.percent,
-                'is_idle': self.is_idle()
+                'timestamp': datetime.datetime.now(),
+                **(status or self._get_status())
             }
             
-            response = requests.post(
+            # Splice the per-beat fields onto the prebuilt identity fields:
+            # '{"device_id":...,"username":"..."' + ',' + '"timestamp":...}'
+            body = self._json_envelope() + b',' + json_dumps(data)[1:]
+            
+            response = self.http.post(
                 f"{self.api_endpoint}/agent-status",
-                json=data,
-                timeout=10
+                data=body,
+                timeout=HTTP_TIMEOUT
             )
             
             if response.status_code == 200 or response.status_code == 201:
                 logger.debug("Heartbeat sent successfully")
+                self._last_successful_contact = time.monotonic()
                 return True
             else:
                 logger.error(f"Failed to send heartbeat: HTTP {response.status_code}, {response.text}")
@@ -735,20 +1280,14 @@ class DesktopAgent:
             logger.error(f"Error sending heartbeat: {e}")
             return False
     
-    def send_event_data(self) -> None:
+    def send_event_data(self, events: Optional[List[Dict[str, Any]]] = None) -> bool:
         """Send accumulated events to the server"""
-        if self.event_queue.empty():
-            return
-        
-        events = []
         try:
-            # Get all events from the queue without blocking
-            while not self.event_queue.empty():
-                events.append(self.event_queue.get_nowait())
-                self.event_queue.task_done()
+            if events is None:
+                events = self.event_queue.drain()
             
             if not events:
-                return
+                return True
             
             data = {
                 'device_id': self.device_id,
@@ -757,19 +1296,268 @@ class DesktopAgent:
                 'events': events
             }
             
-            response = requests.post(
+            body, headers = self._encode_payload(data, compress=True)
+            response = self.http.post(
                 f"{self.api_endpoint}/events",
-                json=data,
-                timeout=10
+                data=body,
+                headers=headers,
+                timeout=HTTP_TIMEOUT
             )
             
             if response.status_code == 200 or response.status_code == 201:
-                logger.debug(f"Events data sent successfully: {len(events)} events")
+                logger.debug("Events data sent successfully: %d events", len(events))
+                return True
             else:
                 logger.error(f"Failed to send events data: HTTP {response.status_code}")
+                return False
                 
         except Exception as e:
             logger.error(f"Error sending events data: {e}")
+            return False
+    
+    def send_ingest(self, activities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send activity samples and pending events to the server in one request; returns the samples not delivered"""
+        if not self.organization_id:
+            logger.error("Cannot send activity data: Missing organization ID")
+            return activities
+        
+        events = self.event_queue.drain()
+        status = self._heartbeat_pending
+        heartbeat = status is not None
+        if not activities and not events and not heartbeat:
+            return []
+        
+        data = {
+            'device_id': self.device_id,
+            'organization_id': self.organization_id,
+            'username': self.username,
+            'timestamp': datetime.datetime.now(),
+            'activities': activities,
+            'events': events
+        }
+        if heartbeat:
+            # Piggy-back the heartbeat rather than posting /agent-status separately
+            self._heartbeat_pending = None
+            data['status'] = status
+        if self.event_queue.dropped:
+            # Running total, so the server can tell data was lost during an outage
+            data['dropped_events'] = self.event_queue.dropped
+        
+        # Prefer the already-open WebSocket over a separate HTTP request
+        if self._send_ws_ingest(data):
+            if heartbeat:
+                self._last_successful_contact = time.monotonic()
+            return []
+        
+        if self.ingest_supported and self._post_ingest(data):
+            return []
+        if not self.ingest_supported:
+            # Older servers, possibly only just found out by _post_ingest, need the separate endpoints
+            return self._send_separately(activities, events, status)
+        
+        # The caller keeps the activities; hold on to the events and heartbeat as well
+        self._requeue(events, status)
+        return activities
+    
+    def _post_ingest(self, data: Dict[str, Any]) -> bool:
+        """POST an ingest batch to /ingest, clearing ingest_supported if the server lacks the endpoint"""
+        try:
+            body, headers = self._encode_payload(data, compress=True)
+            response = self.http.post(
+                f"{self.api_endpoint}/ingest",
+                data=body,
+                headers=headers,
+                timeout=HTTP_TIMEOUT
+            )
+            
+            if response.status_code == 200 or response.status_code == 201:
+                logger.debug("Ingest data sent successfully: %d activities, %d events",
+                             len(data['activities']), len(data['events']))
+                if 'status' in data:
+                    self._last_successful_contact = time.monotonic()
+                return True
+            elif response.status_code == 404:
+                # Older servers only have the separate endpoints
+                logger.info("Server does not support /ingest, using separate activity and event uploads")
+                self.ingest_supported = False
+                return False
+            else:
+                logger.error("Failed to send ingest data: HTTP %d, %s", response.status_code, response.text)
+                return False
+                
+        except Exception as e:
+            logger.error("Error sending ingest data: %s", e)
+            return False
+    
+    def _send_ws_ingest(self, data: Dict[str, Any]) -> bool:
+        """Send ingest data as a WebSocket frame; returns False if HTTP should be used instead"""
+        if not self.connected or not self.ws or not self.ws_thread or not self.ws_thread.is_alive():
+            return False
+        
+        try:
+            frame = {
+                'event': 'ingest',
+                'userId': self.device_id,
+                'organizationId': self.organization_id,
+                'data': data
+            }
+            # websocket-client can't negotiate permessage-deflate, so larger frames are
+            # gzipped here instead and sent as binary; the server inflates them
+            body, headers = self._encode_payload(frame, compress=True)
+            opcode = websocket.ABNF.OPCODE_BINARY if 'Content-Encoding' in headers else websocket.ABNF.OPCODE_TEXT
+            self.ws.send(body, opcode=opcode)
+            logger.debug("Ingest data sent over WebSocket: %d activities, %d events", len(data['activities']), len(data['events']))
+            return True
+        except Exception as e:
+            logger.warning("Failed to send ingest data over WebSocket, falling back to HTTP: %s", e)
+            return False
+    
+    def submit_upload(self, kind: str, func, *func_args) -> bool:
+        """Run an upload in the background pool, skipping it if the previous one of the same kind is still running"""
+        previous = self._uploads_in_flight.get(kind)
+        if previous is not None and not previous.done():
+            logger.debug("Previous %s upload still in progress, skipping", kind)
+            return False
+        
+        try:
+            self._uploads_in_flight[kind] = self._upload_pool.submit(func, *func_args)
+            return True
+        except RuntimeError:
+            # The pool is shut down once the agent is stopping
+            return False
+    
+    def queue_event(self, event: Dict[str, Any]) -> None:
+        """Queue an event and wake the sender thread so it is delivered without waiting for the next tick"""
+        self.event_queue.put(event)
+        self._send_ready.set()
+    
+    def queue_activity(self, activity_data: Optional[Dict[str, Any]]) -> None:
+        """Hand an activity sample (and any pending events) to the sender thread"""
+        if activity_data:
+            pending = self._pending_activity
+            if (pending is not None
+                    and self._activity_key(pending) == self._activity_key(activity_data)
+                    and pending['duration'] < ACTIVITY_MAX_COALESCE):
+                # Nothing changed since the last tick; extend the current sample
+                pending['endTime'] = activity_data['endTime']
+                pending['duration'] += activity_data['duration']
+                if self.event_queue.empty():
+                    return
+            else:
+                if pending is not None:
+                    self._send_buffer.append(pending)
+                self._pending_activity = activity_data
+        
+        self._send_ready.set()
+    
+    @staticmethod
+    def _activity_key(activity_data: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Fields that identify an activity for coalescing consecutive samples"""
+        return (
+            activity_data['application'],
+            activity_data['title'],
+            activity_data['website'],
+            activity_data['isActive']
+        )
+    
+    def run_sender(self) -> None:
+        """Encode and upload queued data in a separate thread so the main loop never blocks on the network"""
+        while self.running:
+            # Sleep until new data is queued or the buffered samples come due,
+            # rather than polling; with nothing buffered, only a signal wakes us
+            timeout = None
+            if self._send_buffer:
+                timeout = max(0.0, self._last_flush + ACTIVITY_FLUSH_INTERVAL - time.monotonic())
+            self._send_ready.wait(timeout)
+            self._send_ready.clear()
+            if self._flush_due():
+                # Give the rest of a burst (several restricted-app events from one
+                # scan, a heartbeat due on the same tick) a moment to arrive
+                self._stop_event.wait(EVENT_COALESCE_WINDOW)
+                self._send_ready.clear()
+                self._flush_send_buffer()
+        
+        # Push out whatever was collected before shutdown
+        if self._pending_activity is not None:
+            self._send_buffer.append(self._pending_activity)
+            self._pending_activity = None
+        self._flush_send_buffer()
+    
+    def _flush_due(self) -> bool:
+        """Events and heartbeats go out immediately; activity samples are batched by count or age"""
+        if self._heartbeat_pending is not None or not self.event_queue.empty():
+            return True
+        if not self._send_buffer:
+            return False
+        return (len(self._send_buffer) >= ACTIVITY_BATCH_SIZE
+                or time.monotonic() - self._last_flush >= ACTIVITY_FLUSH_INTERVAL)
+    
+    def _flush_send_buffer(self) -> None:
+        """Send every buffered activity sample in a single ingest request"""
+        self._last_flush = time.monotonic()
+        activities = []
+        while self._send_buffer:
+            activities.append(self._send_buffer.popleft())
+        
+        failed = self.send_ingest(activities)
+        if failed:
+            # Keep the undelivered samples for the next attempt; the deque bound caps memory use
+            self._send_buffer.extendleft(reversed(failed))
+    
+    def _send_separately(self, activities: List[Dict[str, Any]], events: List[Dict[str, Any]],
+                         status: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Send activities, events and a heartbeat through the legacy per-kind endpoints; returns the activities that failed"""
+        # Only the failures are retried, so the server never gets a sample twice
+        failed = [activity_data for activity_data in activities if not self.send_activity_data(activity_data)]
+        if not self.send_event_data(events):
+            self._requeue(events, None)
+        if status is not None and not self.send_heartbeat(status):
+            self._requeue([], status)
+        return failed
+    
+    def _requeue(self, events: List[Dict[str, Any]], status: Optional[Dict[str, Any]]) -> None:
+        """Keep the events and heartbeat of a failed upload for the next attempt"""
+        if events:
+            # Events that no longer fit are counted in dropped_events
+            self.event_queue.requeue(events)
+        if status is not None and self._heartbeat_pending is None:
+            # Unless a newer heartbeat was requested in the meantime
+            self._heartbeat_pending = status
+    
+    def _on_restricted_apps_update(self, data: Dict[str, Any]) -> None:
+        """Handle a restricted_apps_update message"""
+        self.set_restricted_apps(data.get('restricted_apps', []))
+        logger.info("Received restricted apps update: %s", self.restricted_apps)
+        self.schedule_save_config()
+    
+    def _on_config_update(self, config_data: Dict[str, Any]) -> None:
+        """Handle a config_update message"""
+        logger.info("Received configuration update")
+        
+        # Update agent settings
+        if 'screenshot_enabled' in config_data:
+            self.screenshot_enabled = config_data['screenshot_enabled']
+        
+        if 'activity_tracking_enabled' in config_data:
+            self.activity_tracking_enabled = config_data['activity_tracking_enabled']
+        
+        if 'idle_threshold' in config_data:
+            self.idle_threshold = config_data['idle_threshold']
+        
+        # Save the updated config
+        self.schedule_save_config()
+    
+    def _on_take_screenshot_now(self, data: Dict[str, Any]) -> None:
+        """Handle a take_screenshot_now message"""
+        logger.info("Received request for immediate screenshot")
+        # Capture and upload off the WebSocket thread so messages keep flowing
+        self.submit_upload('screenshot', self.capture_and_send_screenshot)
+    
+    def _on_terminate_application(self, app_data: Dict[str, Any]) -> None:
+        """Handle a terminate_application message"""
+        if 'pid' in app_data and 'name' in app_data:
+            logger.info(f"Received request to terminate application: {app_data['name']} (PID: {app_data['pid']})")
+            self.terminate_process(app_data['pid'], app_data['name'])
     
     def connect_websocket(self) -> None:
         """Establish WebSocket connection to server for real-time updates"""
@@ -783,42 +1571,12 @@ class DesktopAgent:
         # Define WebSocket callbacks
         def on_message(ws, message):
             try:
-                data = json.loads(message)
-                logger.debug(f"WebSocket message received: {data.get('event', 'unknown')}")
+                data = json_loads(message)
+                logger.debug("WebSocket message received: %s", data.get('event', 'unknown'))
                 
-                if data.get('event') == 'restricted_apps_update':
-                    self.restricted_apps = data.get('data', {}).get('restricted_apps', [])
-                    logger.info(f"Received restricted apps update: {self.restricted_apps}")
-                    self.save_config()
-                
-                elif data.get('event') == 'config_update':
-                    config_data = data.get('data', {})
-                    logger.info("Received configuration update")
-                    
-                    # Update agent settings
-                    if 'screenshot_enabled' in config_data:
-                        self.screenshot_enabled = config_data['screenshot_enabled']
-                    
-                    if 'activity_tracking_enabled' in config_data:
-                        self.activity_tracking_enabled = config_data['activity_tracking_enabled']
-                    
-                    if 'idle_threshold' in config_data:
-                        self.idle_threshold = config_data['idle_threshold']
-                    
-                    # Save the updated config
-                    self.save_config()
-                
-                elif data.get('event') == 'take_screenshot_now':
-                    logger.info("Received request for immediate screenshot")
-                    screenshot_data = self.take_screenshot()
-                    if screenshot_data:
-                        self.send_screenshot(screenshot_data)
-                
-                elif data.get('event') == 'terminate_application':
-                    app_data = data.get('data', {})
-                    if 'pid' in app_data and 'name' in app_data:
-                        logger.info(f"Received request to terminate application: {app_data['name']} (PID: {app_data['pid']})")
-                        self.terminate_process(app_data['pid'], app_data['name'])
+                handler = self._ws_handlers.get(data.get('event'))
+                if handler is not None:
+                    handler(data.get('data', {}))
             except Exception as e:
                 logger.error(f"Error processing WebSocket message: {e}")
         
@@ -833,9 +1591,10 @@ class DesktopAgent:
         def on_open(ws):
             logger.info("WebSocket connection established")
             self.connected = True
+            self._ws_attempts = 0
             
             # Send initial connection message
-            ws.send(json.dumps({
+            ws.send(json_dumps({
                 'event': 'agent_connected',
                 'userId': self.device_id,
                 'organizationId': self.organization_id,
@@ -857,6 +1616,12 @@ class DesktopAgent:
             on_close=on_close
         )
     
+    def _ws_reconnect_delay(self) -> float:
+        """Full-jitter exponential backoff: uniform in [0, 2^k - 1] seconds, capped"""
+        ceiling = min(WS_RECONNECT_MAX_DELAY, 2 ** min(self._ws_attempts, 8) - 1)
+        self._ws_attempts += 1
+        return random.uniform(0, ceiling)
+    
     def run_websocket(self) -> None:
         """Run WebSocket connection in a separate thread"""
         while self.running:
@@ -866,15 +1631,25 @@ class DesktopAgent:
                     logger.info("Starting WebSocket connection...")
                     self.connect_websocket()
                     
-                    # Run forever; this call blocks until the connection is closed
-                    self.ws.run_forever(ping_interval=30, ping_timeout=10)
-                    
-                    # If we get here, the connection was closed
-                    logger.info("WebSocket connection ended, will retry...")
-                    time.sleep(5)  # Wait before reconnecting
+                    # Run forever; websocket-client keeps the link alive with ping/pong
+                    # and this call blocks until the connection is closed. Every text
+                    # frame goes straight to json_loads, which rejects bad UTF-8 anyway,
+                    # so skip websocket-client's pure-Python UTF-8 validation pass.
+                    self.ws.run_forever(ping_interval=30, ping_timeout=10, skip_utf8_validation=True)
             except Exception as e:
                 logger.error(f"Error in WebSocket thread: {e}")
-                time.sleep(5)  # Wait before reconnecting
+            
+            if self.running:
+                # Back off with jitter so agents don't reconnect in lockstep after an outage
+                delay = self._ws_reconnect_delay()
+                logger.info("WebSocket connection ended, retrying in %.1f seconds", delay)
+                self._stop_event.wait(delay)
+    
+    @staticmethod
+    def _next_deadline(deadline: float, interval: float, now: float) -> float:
+        """Advance a periodic deadline by one interval, restarting from now if it fell more than an interval behind"""
+        deadline += interval
+        return deadline if deadline > now else now + interval
     
     def run(self) -> None:
         """Main agent loop"""
@@ -884,7 +1659,7 @@ class DesktopAgent:
                 self.needs_init = False
             else:
                 logger.warning("Agent initialization failed, will retry...")
-                time.sleep(30)
+                self._stop_event.wait(30)
                 return
         
         # Start WebSocket thread
@@ -894,43 +1669,59 @@ class DesktopAgent:
             self.ws_thread.start()
             logger.info("WebSocket thread started")
         
-        # Tracking variables
-        last_screenshot_time = time.time()
-        last_heartbeat_time = time.time()
+        # Start sender thread
+        if not self.sender_thread or not self.sender_thread.is_alive():
+            self.sender_thread = threading.Thread(target=self.run_sender)
+            self.sender_thread.daemon = True
+            self.sender_thread.start()
+            logger.info("Sender thread started")
+        
+        # Everything is scheduled on monotonic deadlines: wall-clock jumps (NTP, DST)
+        # can't skip or repeat work, and time spent doing the work doesn't push
+        # later ticks back. Each job keeps its own deadline.
+        now = time.monotonic()
+        next_tick = now
+        next_screenshot = now + SCREENSHOT_INTERVAL
+        
+        # A registration just made already counts as this interval's heartbeat;
+        # otherwise announce the agent straight away
+        if self._last_successful_contact is not None:
+            next_heartbeat = self._last_successful_contact + HEARTBEAT_INTERVAL
+        else:
+            next_heartbeat = now
         
         while self.running:
-            current_time = time.time()
+            now = time.monotonic()
+            next_tick += ACTIVITY_CHECK_INTERVAL
             
             try:
-                # Check for restricted applications
-                self.check_restricted_apps()
+                # Check for restricted applications (adaptive interval)
+                self._maybe_check_restricted_apps()
                 
                 # Track current activity
                 activity_data = self.track_activity()
-                if activity_data:
-                    self.send_activity_data(activity_data)
                 
                 # Take periodic screenshots
-                if current_time - last_screenshot_time >= SCREENSHOT_INTERVAL:
-                    screenshot_data = self.take_screenshot()
-                    if screenshot_data:
-                        self.send_screenshot(screenshot_data)
-                    last_screenshot_time = current_time
+                if now >= next_screenshot:
+                    self.submit_upload('screenshot', self.capture_and_send_screenshot)
+                    next_screenshot = self._next_deadline(next_screenshot, SCREENSHOT_INTERVAL, now)
                 
                 # Send periodic heartbeats
-                if current_time - last_heartbeat_time >= HEARTBEAT_INTERVAL:
-                    self.send_heartbeat()
-                    last_heartbeat_time = current_time
+                if now >= next_heartbeat:
+                    self.request_heartbeat()
+                    next_heartbeat = self._next_deadline(next_heartbeat, HEARTBEAT_INTERVAL, now)
                 
-                # Send any pending events
-                self.send_event_data()
-                
-                # Sleep for the activity check interval
-                time.sleep(ACTIVITY_CHECK_INTERVAL)
+                # Upload the activity sample and any pending events in the background
+                self.queue_activity(activity_data)
                 
             except Exception as e:
-                logger.error(f"Error in main loop: {e}")
-                time.sleep(ACTIVITY_CHECK_INTERVAL)
+                logger.error("Error in main loop: %s", e)
+            
+            # Sleep until the next tick, waking early on shutdown
+            now = time.monotonic()
+            if next_tick < now:
+                next_tick = now  # Fell behind; don't try to catch up with a burst of ticks
+            self._stop_event.wait(next_tick - now)
 
 def main():
     """Main entry point"""
@@ -945,6 +1736,11 @@ def main():
             # If agent.running is False, it's time to exit
             if not agent.running:
                 break
+        
+        # The sender is a daemon thread, so it would die with the interpreter;
+        # let its final flush finish first
+        if agent.sender_thread is not None:
+            agent.sender_thread.join(timeout=SHUTDOWN_FLUSH_TIMEOUT)
     except Exception as e:
         logger.critical(f"Critical error in agent: {e}")
         sys.exit(1)
@@ -8,6 +8,7 @@ import os
 import sys
 import shutil
 import platform
+import zipfile
 import argparse
 import subprocess
 from pathlib import Path
@@ -73,7 +74,7 @@ def build_agent(org_id=None, output_dir=None):
     with open(req_path, "w") as f:
         f.write("psutil>=5.8.0\n")
         f.write("requests>=2.25.1\n")
-        f.write("websocket-client>=1.0.0\n")
+        f.write("websocket-client>=1.4.0\n")
     
     # Create platform-specific files
     if platform.system() == "Windows":
@@ -99,11 +100,16 @@ def build_agent(org_id=None, output_dir=None):
     if os.path.exists(zip_path):
         os.remove(zip_path)
     
-    shutil.make_archive(
-        os.path.join(output_dir, zip_name),
-        'zip',
-        build_dir
-    )
+    # Write the archive directly so every entry is deflated; the package is
+    # downloaded by each installed agent, so its size matters more than build time
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for root, dirs, files in os.walk(build_dir):
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            for name in files:
+                if name.endswith(".pyc"):
+                    continue
+                file_path = os.path.join(root, name)
+                zf.write(file_path, arcname=os.path.relpath(file_path, build_dir))
     
     print(f"Successfully created agent package: {zip_path}")
     return zip_path
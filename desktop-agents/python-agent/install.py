@@ -7,6 +7,7 @@ This script sets up the agent configuration and installs required dependencies.
 import os
 import sys
 import json
+import shutil
 import subprocess
 import platform
 import getpass
@@ -30,9 +31,9 @@ def main():
     agent_dest = os.path.join(install_dir, "agent.py")
     
     try:
-        with open(agent_script, "r") as src:
-            with open(agent_dest, "w") as dest:
-                dest.write(src.read())
+        # Byte-for-byte copy (done in the kernel where the OS supports it), so the
+        # script is never decoded and its line endings are left alone
+        shutil.copyfile(agent_script, agent_dest)
         os.chmod(agent_dest, 0o755)  # Make executable
         print(f"Installed agent to: {agent_dest}")
     except Exception as e:
@@ -7,12 +7,17 @@ This script installs and configures the ActivTrack agent with the provided organ
 import os
 import sys
 import json
-import shutil
-import platform
+import shlex
+import string
 import argparse
-import subprocess
+import functools
+import importlib.util
 from pathlib import Path
 
+# subprocess, shutil, tempfile, concurrent.futures and xml.sax.saxutils (which pulls in
+# urllib and http.client) are imported in the functions that use them, so --help and
+# argument errors don't pay for them
+
 # Parse arguments
 parser = argparse.ArgumentParser(description="ActivTrack Agent Installer")
 parser.add_argument("--org_id", type=int, help="Organization ID")
@@ -27,12 +32,67 @@ API_URL = args.api_url
 WS_URL = args.ws_url
 DEBUG = args.debug
 
+# Host operating system ("Windows", "Darwin", "Linux", ...), as platform.system() reports it
+SYSTEM = "Windows" if os.name == "nt" else os.uname().sysname
+
 # Installation paths
 HOME_DIR = Path.home()
 INSTALL_DIR = HOME_DIR / ".activtrack"
 CONFIG_FILE = INSTALL_DIR / "config.json"
 AGENT_SCRIPT = INSTALL_DIR / "agent.py"
 LOG_FILE = INSTALL_DIR / "agent.log"
+# The background agent's stdout/stderr. Kept apart from agent.log, which the agent
+# rotates itself and which must not be held open by anyone else.
+OUTPUT_FILE = INSTALL_DIR / "agent.out"
+
+# Autostart paths
+STARTUP_FOLDER = Path(os.environ.get("APPDATA", "")) / "Microsoft" / "Windows" / "Start Menu" / "Programs" / "Startup"
+STARTUP_FILE = STARTUP_FOLDER / "ActivTrack.bat"
+LAUNCH_AGENTS_DIR = HOME_DIR / "Library" / "LaunchAgents"
+PLIST_PATH = LAUNCH_AGENTS_DIR / "com.activtrack.agent.plist"
+SYSTEMD_DIR = HOME_DIR / ".config" / "systemd" / "user"
+SERVICE_PATH = SYSTEMD_DIR / "activtrack.service"
+
+# pip options shared by every dependency download and install; psutil has no
+# pure-Python fallback, so a source build means a C compile that stock machines may fail
+PIP_OPTIONS = ["--disable-pip-version-check", "--no-input", "--prefer-binary"]
+
+# Autostart file templates, compiled once
+PLIST_TEMPLATE = string.Template("""<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
+<plist version="1.0">
+<dict>
+    <key>Label</key>
+    <string>com.activtrack.agent</string>
+    <key>ProgramArguments</key>
+    <array>
+        $program_arguments
+    </array>
+    <key>RunAtLoad</key>
+    <true/>
+    <key>KeepAlive</key>
+    <true/>
+    <key>StandardOutPath</key>
+    <string>$output_file</string>
+    <key>StandardErrorPath</key>
+    <string>$output_file</string>
+</dict>
+</plist>
+""")
+
+SERVICE_TEMPLATE = string.Template("""[Unit]
+Description=ActivTrack Agent
+After=network.target
+
+[Service]
+Type=simple
+ExecStart=$exec_start
+Restart=always
+RestartSec=10
+
+[Install]
+WantedBy=default.target
+""")
 
 # Make sure the directory exists
 INSTALL_DIR.mkdir(exist_ok=True)
@@ -48,6 +108,19 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+# Only color a terminal that asked for it; escapes would just clutter a redirected log
+USE_COLOR = sys.stdout.isatty() and os.environ.get("NO_COLOR") is None
+if not USE_COLOR:
+    for name in [name for name in vars(Colors) if name.isupper()]:
+        setattr(Colors, name, '')
+
+# Message prefixes, built once
+STEP_PREFIX = f"{Colors.BOLD}{Colors.GREEN}[STEP "
+STEP_SUFFIX = f"]{Colors.END} "
+INFO_PREFIX = f"{Colors.BLUE}[INFO]{Colors.END} "
+WARNING_PREFIX = f"{Colors.YELLOW}[WARNING]{Colors.END} "
+ERROR_PREFIX = f"{Colors.RED}[ERROR]{Colors.END} "
+
 def print_banner():
     """Print the installer banner"""
     print(f"{Colors.BLUE}{'='*70}{Colors.END}")
@@ -57,19 +130,19 @@ def print_banner():
 
 def print_step(step_number, message):
     """Print a step in the installation process"""
-    print(f"{Colors.BOLD}{Colors.GREEN}[STEP {step_number}]{Colors.END} {message}...")
+    sys.stdout.write(STEP_PREFIX + str(step_number) + STEP_SUFFIX + message + "...\n")
 
 def print_info(message):
     """Print an informational message"""
-    print(f"{Colors.BLUE}[INFO]{Colors.END} {message}")
+    sys.stdout.write(INFO_PREFIX + message + "\n")
 
 def print_warning(message):
     """Print a warning message"""
-    print(f"{Colors.YELLOW}[WARNING]{Colors.END} {message}")
+    sys.stdout.write(WARNING_PREFIX + message + "\n")
 
 def print_error(message):
     """Print an error message"""
-    print(f"{Colors.RED}[ERROR]{Colors.END} {message}")
+    sys.stdout.write(ERROR_PREFIX + message + "\n")
 
 def check_python_version():
     """Check if the Python version is compatible"""
@@ -82,22 +155,188 @@ def check_python_version():
     
     print_info(f"Python version {sys.version} is compatible")
 
+def prefetch_dependencies(dependencies, dest):
+    """Download the dependencies into dest in parallel, so the downloads overlap"""
+    import subprocess
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
+    # Only the downloads run concurrently; parallel pip installs into the same
+    # site-packages could clobber each other's shared dependencies
+    command = [sys.executable, "-m", "pip", "download", *PIP_OPTIONS, "--only-binary=:all:", "--dest", dest]
+    
+    with ThreadPoolExecutor(max_workers=len(dependencies)) as pool:
+        futures = {pool.submit(subprocess.run, [*command, dep], capture_output=True): dep for dep in dependencies}
+        for future in as_completed(futures):
+            if future.result().returncode != 0:
+                print_warning(f"Could not prefetch {futures[future]}, it will be downloaded during install")
+
+def pip_check_call(arguments):
+    """Run pip like subprocess.check_call, inside this interpreter when pip's internals can be imported"""
+    import subprocess
+    
+    # Running pip in-process skips starting a second interpreter and importing pip
+    # there; its internal API isn't stable though, so fall back to python -m pip
+    try:
+        from pip._internal.cli.main import main as pip_main
+    except ImportError:
+        pip_main = None
+    
+    if pip_main is None:
+        returncode = subprocess.call([sys.executable, "-m", "pip", *arguments])
+    else:
+        try:
+            returncode = pip_main(list(arguments))
+        except SystemExit as e:
+            returncode = e.code if e.code is None or isinstance(e.code, int) else 1
+    
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, ["pip", *arguments])
+
 def install_dependencies():
     """Install required dependencies"""
+    import subprocess
+    import tempfile
+    
     print_step(2, "Installing dependencies")
     
-    dependencies = ["psutil", "requests", "websocket-client"]
+    # pip package name -> module it provides
+    packages = {"psutil": "psutil", "requests": "requests", "websocket-client": "websocket"}
+    
+    # On a re-install everything is usually present already; finding a module is
+    # far cheaper than letting pip resolve and check each package
+    dependencies = [name for name, module in packages.items() if importlib.util.find_spec(module) is None]
+    if not dependencies:
+        print_info("All dependencies are already installed")
+        return
     
-    for dep in dependencies:
-        print_info(f"Installing {dep}...")
+    # orjson speeds up the agent's uploads but isn't required; it is only taken as
+    # a prebuilt wheel alongside the required packages, never built from source
+    optional = [name for name, module in {"orjson": "orjson"}.items() if importlib.util.find_spec(module) is None]
+    
+    with tempfile.TemporaryDirectory() as download_dir:
+        print_info(f"Downloading {', '.join(dependencies + optional)}...")
+        prefetch_dependencies(dependencies + optional, download_dir)
+        
+        # Install from the prefetched files, still falling back to the index for anything missing
+        pip_install = ["install", *PIP_OPTIONS, "--find-links", download_dir]
+        
+        # One pip run resolves and installs everything in a single pass.
+        # Wheels only at first, so nothing gets compiled; allow source builds only if a
+        # platform has no wheel for something.
+        print_info(f"Installing {', '.join(dependencies)}...")
         try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", dep])
+            try:
+                pip_check_call([*pip_install, "--only-binary=:all:", *dependencies, *optional])
+            except subprocess.CalledProcessError:
+                print_warning("No prebuilt packages for this platform, allowing source builds")
+                pip_check_call([*pip_install, *dependencies])
         except subprocess.CalledProcessError:
-            print_error(f"Failed to install {dep}")
-            sys.exit(1)
+            # Retry one at a time so a single broken package doesn't hide which one failed
+            print_warning("Batched install failed, installing dependencies one at a time")
+            for dep in dependencies:
+                print_info(f"Installing {dep}...")
+                try:
+                    pip_check_call([*pip_install, dep])
+                except subprocess.CalledProcessError:
+                    print_error(f"Failed to install {dep}")
+                    sys.exit(1)
     
+    # Let this process import what pip just installed
+    importlib.invalidate_caches()
     print_info("All dependencies installed successfully")
 
+def dump_json(obj):
+    """Serialize an object to indented JSON bytes, using orjson when it is installed"""
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+def write_file(path, data):
+    """Atomically replace a file with the given bytes, written unbuffered (these files are all a few KiB)"""
+    import tempfile
+    
+    # Write a temporary file in the same directory and rename it over the target, so an
+    # interrupted install never leaves a truncated config, plist or unit behind
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates the file owner-only
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def fast_copy(src, dst):
+    """Copy a file's contents in the kernel where possible (copy_file_range, then sendfile)"""
+    chunk = 1 << 20
+    
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        
+        copiers = []
+        if hasattr(os, "copy_file_range"):  # Linux; can reflink on copy-on-write filesystems
+            copiers.append(lambda offset: os.copy_file_range(src_fd, dst_fd, chunk, offset, offset))
+        if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+            copiers.append(lambda offset: os.sendfile(dst_fd, src_fd, offset, chunk))
+        
+        for copy_chunk in copiers:
+            try:
+                offset = 0
+                while True:
+                    copied = copy_chunk(offset)
+                    if copied == 0:
+                        return
+                    offset += copied
+            except OSError:
+                # Not supported here (e.g. across filesystems); start over with the next method
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+                os.ftruncate(dst_fd, 0)
+        
+        # Portable fallback in user space: read into one reused buffer rather than
+        # allocating a fresh bytes object per chunk as shutil.copyfileobj does
+        buf = bytearray(chunk)
+        view = memoryview(buf)
+        while True:
+            read = fsrc.readinto(buf)
+            if not read:
+                break
+            fdst.write(view[:read])
+
+def link_or_copy(src, dst):
+    """Hardlink dst to src when both are on the same filesystem, otherwise copy it; returns True if linked"""
+    import shutil
+    
+    try:
+        if os.path.samefile(src, dst):
+            return True  # Already installed from this very file (e.g. a previous hardlink)
+        os.remove(dst)
+    except FileNotFoundError:
+        pass
+    
+    if SYSTEM != "Windows":
+        try:
+            # Only metadata changes, no data copied
+            os.link(src, dst)
+            return True
+        except OSError:
+            pass  # EXDEV across filesystems, or links not supported here
+    
+    fast_copy(src, dst)
+    shutil.copystat(src, dst)
+    return False
+
 def copy_agent_script():
     """Copy the agent script to the installation directory"""
     print_step(3, "Installing agent script")
@@ -109,8 +348,10 @@ def copy_agent_script():
         sys.exit(1)
     
     try:
-        shutil.copy2(script_path, AGENT_SCRIPT)
-        os.chmod(AGENT_SCRIPT, 0o755)  # Make executable
+        # A hardlink shares its mode with the user's extracted copy, so only a
+        # copy of our own is made executable; the agent is run through python anyway
+        if not link_or_copy(script_path, AGENT_SCRIPT):
+            os.chmod(AGENT_SCRIPT, 0o755)  # Make executable
         print_info(f"Agent script installed to {AGENT_SCRIPT}")
     except Exception as e:
         print_error(f"Failed to copy agent script: {e}")
@@ -134,80 +375,88 @@ def create_config_file():
     }
     
     try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=2)
+        write_file(CONFIG_FILE, dump_json(config))
         print_info(f"Configuration file created at {CONFIG_FILE}")
     except Exception as e:
         print_error(f"Failed to create configuration file: {e}")
         sys.exit(1)
 
+@functools.lru_cache(maxsize=None)
+def windows_gui_python():
+    """Locate pythonw.exe once, preferring the one next to the running interpreter"""
+    import shutil
+    
+    candidate = Path(sys.executable).with_name("pythonw.exe")
+    if candidate.exists():
+        return str(candidate)
+    return shutil.which("pythonw") or "pythonw"
+
+def agent_command(python=sys.executable):
+    """Build the command line that runs the installed agent with this installation's settings"""
+    return [
+        python, str(AGENT_SCRIPT),
+        *(["--org_id", str(ORG_ID)] if ORG_ID else []),
+        "--api_url", API_URL,
+        "--ws_url", WS_URL,
+        *(["--debug"] if DEBUG else [])
+    ]
+
+def batch_quote(arg):
+    """Quote an argument for a line of a .bat file"""
+    # Inside double quotes cmd.exe leaves characters like & and | alone, but it still
+    # expands %VAR% (in a batch file %% is a literal %) and has no way to escape a quote
+    if any(c in arg for c in '"\r\n'):
+        raise ValueError(f"Cannot use {arg!r} in a startup script: it contains a quote or line break")
+    return '"' + arg.replace('%', '%%') + '"'
+
 def setup_autostart():
     """Setup the agent to run at system startup"""
-    print_step(5, "Setting up autostart")
+    import subprocess
     
-    system = platform.system()
+    print_step(5, "Setting up autostart")
     
-    if system == "Windows":
+    if SYSTEM == "Windows":
         # Create a Windows shortcut in the Startup folder
         print_info("Setting up Windows autostart...")
         try:
-            startup_folder = Path(os.environ["APPDATA"]) / "Microsoft" / "Windows" / "Start Menu" / "Programs" / "Startup"
-            startup_file = startup_folder / "ActivTrack.bat"
+            # STARTUP_FOLDER is only meaningful when APPDATA is set
+            if not os.environ.get("APPDATA"):
+                raise RuntimeError("APPDATA is not set")
             
-            with open(startup_file, 'w') as f:
-                f.write(f'@echo off\n')
-                f.write(f'pythonw "{AGENT_SCRIPT}" --org_id {ORG_ID or ""} --api_url {API_URL} --ws_url {WS_URL} {"--debug" if DEBUG else ""}\n')
+            batch_content = "\r\n".join([
+                "@echo off",
+                " ".join(batch_quote(arg) for arg in agent_command(windows_gui_python())),
+                ""
+            ])
             
-            print_info(f"Autostart script created at {startup_file}")
+            write_file(STARTUP_FILE, batch_content.encode('utf-8'))
+            
+            print_info(f"Autostart script created at {STARTUP_FILE}")
         except Exception as e:
             print_error(f"Failed to setup Windows autostart: {e}")
             print_info("You may need to manually add the agent to startup.")
     
-    elif system == "Darwin":  # macOS
+    elif SYSTEM == "Darwin":  # macOS
         # Create a launchd plist file
+        from xml.sax.saxutils import escape
+        
         print_info("Setting up macOS autostart...")
         try:
-            launch_agents_dir = HOME_DIR / "Library" / "LaunchAgents"
-            launch_agents_dir.mkdir(exist_ok=True)
-            
-            plist_path = launch_agents_dir / "com.activtrack.agent.plist"
+            LAUNCH_AGENTS_DIR.mkdir(exist_ok=True)
             
-            plist_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
-<plist version="1.0">
-<dict>
-    <key>Label</key>
-    <string>com.activtrack.agent</string>
-    <key>ProgramArguments</key>
-    <array>
-        <string>{sys.executable}</string>
-        <string>{AGENT_SCRIPT}</string>
-        {"<string>--org_id</string><string>" + str(ORG_ID) + "</string>" if ORG_ID else ""}
-        <string>--api_url</string>
-        <string>{API_URL}</string>
-        <string>--ws_url</string>
-        <string>{WS_URL}</string>
-        {"<string>--debug</string>" if DEBUG else ""}
-    </array>
-    <key>RunAtLoad</key>
-    <true/>
-    <key>KeepAlive</key>
-    <true/>
-    <key>StandardOutPath</key>
-    <string>{LOG_FILE}</string>
-    <key>StandardErrorPath</key>
-    <string>{LOG_FILE}</string>
-</dict>
-</plist>
-"""
+            plist_content = PLIST_TEMPLATE.substitute(
+                program_arguments="\n        ".join(
+                    "<string>%s</string>" % escape(arg) for arg in agent_command()
+                ),
+                output_file=escape(str(OUTPUT_FILE))
+            )
             
-            with open(plist_path, 'w') as f:
-                f.write(plist_content)
+            write_file(PLIST_PATH, plist_content.encode('utf-8'))
             
             # Load the plist
-            subprocess.run(["launchctl", "load", plist_path])
+            subprocess.run(["launchctl", "load", PLIST_PATH])
             
-            print_info(f"LaunchAgent created at {plist_path}")
+            print_info(f"LaunchAgent created at {PLIST_PATH}")
         except Exception as e:
             print_error(f"Failed to setup macOS autostart: {e}")
             print_info("You may need to manually add the agent to startup.")
@@ -216,62 +465,59 @@ def setup_autostart():
         # Create a systemd user service
         print_info("Setting up Linux autostart...")
         try:
-            systemd_dir = HOME_DIR / ".config" / "systemd" / "user"
-            systemd_dir.mkdir(exist_ok=True, parents=True)
+            SYSTEMD_DIR.mkdir(exist_ok=True, parents=True)
             
-            service_path = systemd_dir / "activtrack.service"
+            service_content = SERVICE_TEMPLATE.substitute(
+                exec_start=" ".join(shlex.quote(arg) for arg in agent_command())
+            )
             
-            service_content = f"""[Unit]
-Description=ActivTrack Agent
-After=network.target
-
-[Service]
-Type=simple
-ExecStart={sys.executable} {AGENT_SCRIPT} {"--org_id " + str(ORG_ID) if ORG_ID else ""} --api_url {API_URL} --ws_url {WS_URL} {"--debug" if DEBUG else ""}
-Restart=always
-RestartSec=10
-
-[Install]
-WantedBy=default.target
-"""
-            
-            with open(service_path, 'w') as f:
-                f.write(service_content)
+            write_file(SERVICE_PATH, service_content.encode('utf-8'))
             
-            # Enable and start the service
-            subprocess.run(["systemctl", "--user", "enable", "activtrack.service"])
-            subprocess.run(["systemctl", "--user", "start", "activtrack.service"])
+            # Enable and start the service in one systemctl call
+            subprocess.run(["systemctl", "--user", "enable", "--now", "activtrack.service"], check=False)
             
-            print_info(f"Systemd service created at {service_path}")
+            print_info(f"Systemd service created at {SERVICE_PATH}")
         except Exception as e:
             print_error(f"Failed to setup Linux autostart: {e}")
             print_info("You may need to manually add the agent to startup.")
 
 def start_agent():
     """Start the agent"""
+    import subprocess
+    
     print_step(6, "Starting the agent")
     
     try:
         # Start the agent in the background
-        if platform.system() == "Windows":
-            # For Windows, use pythonw to hide the console window
-            subprocess.Popen(["pythonw", str(AGENT_SCRIPT), 
-                               *(["--org_id", str(ORG_ID)] if ORG_ID else []),
-                               "--api_url", API_URL, 
-                               "--ws_url", WS_URL,
-                               *(["--debug"] if DEBUG else [])])
+        if SYSTEM == "Windows":
+            # For Windows, use pythonw to hide the console window, fully detached from
+            # this console and with no handles of ours, so the installer can exit cleanly
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            startupinfo.wShowWindow = subprocess.SW_HIDE
+            flags = (getattr(subprocess, "CREATE_NO_WINDOW", 0x08000000)
+                     | getattr(subprocess, "DETACHED_PROCESS", 0x00000008)
+                     | subprocess.CREATE_NEW_PROCESS_GROUP)
+            # Output goes to agent.out: a handle on agent.log would make the agent's
+            # own log rotation fail, since Windows can't rename an open file
+            with open(OUTPUT_FILE, 'ab') as log:
+                subprocess.Popen(agent_command(windows_gui_python()), creationflags=flags,
+                                 startupinfo=startupinfo, close_fds=True,
+                                 stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT)
         else:
-            # For Unix-like systems, use nohup to keep it running after terminal closes
-            cmd = [sys.executable, str(AGENT_SCRIPT)]
-            if ORG_ID:
-                cmd.extend(["--org_id", str(ORG_ID)])
-            cmd.extend(["--api_url", API_URL, "--ws_url", WS_URL])
-            if DEBUG:
-                cmd.append("--debug")
-                
-            with open(LOG_FILE, 'a') as log:
-                subprocess.Popen(cmd, stdout=log, stderr=log, 
-                                  start_new_session=True)
+            # For Unix-like systems, start a new session to keep it running after terminal closes
+            command = agent_command()
+            try:
+                # posix_spawn avoids copying this process's page tables the way fork does
+                os.posix_spawn(command[0], command, os.environ, file_actions=[
+                    (os.POSIX_SPAWN_OPEN, 1, str(OUTPUT_FILE), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644),
+                    (os.POSIX_SPAWN_DUP2, 1, 2)
+                ], setsid=True)
+            except (AttributeError, NotImplementedError):
+                # Python < 3.8, or no setsid support in this platform's posix_spawn
+                with open(OUTPUT_FILE, 'a') as log:
+                    subprocess.Popen(command, stdout=log, stderr=log, 
+                                      start_new_session=True)
         
         print_info("Agent started successfully")
     except Exception as e:
@@ -296,14 +542,19 @@ def main():
     setup_autostart()
     start_agent()
     
-    print()
-    print(f"{Colors.BOLD}{Colors.GREEN}ActivTrack Agent installation complete!{Colors.END}")
-    print(f"The agent is now running in the background.")
-    print(f"Log file: {LOG_FILE}")
-    print(f"Configuration file: {CONFIG_FILE}")
-    print()
-    print(f"{Colors.YELLOW}Note: You may need to restart your computer for autostart to take effect.{Colors.END}")
-    print(f"{Colors.BLUE}{'='*70}{Colors.END}")
+    # Print the summary in one write
+    sys.stdout.write("\n".join([
+        "",
+        f"{Colors.BOLD}{Colors.GREEN}ActivTrack Agent installation complete!{Colors.END}",
+        "The agent is now running in the background.",
+        f"Log file: {LOG_FILE}",
+        f"Configuration file: {CONFIG_FILE}",
+        "",
+        f"{Colors.YELLOW}Note: You may need to restart your computer for autostart to take effect.{Colors.END}",
+        f"{Colors.BLUE}{'='*70}{Colors.END}",
+        ""
+    ]))
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
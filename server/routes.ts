@@ -1,6 +1,7 @@
 import express, { type Express, Request, Response, NextFunction } from "express";
 import { createServer, type Server } from "http";
 import { WebSocketServer, WebSocket } from "ws";
+import { gunzipSync } from "zlib";
 import { storage } from "./storage";
 import { insertUserSchema, insertActivitySchema, insertApplicationSchema, insertWebsiteSchema, insertDailySummarySchema, insertProjectSchema } from "@shared/schema";
 import { z } from "zod";
@@ -1012,6 +1013,44 @@ export async function registerRoutes(app: Express): Promise<Server> {
     }
   });
 
+  // Agent Ingest Endpoint - Receives activity samples and events in a single request
+  router.post("/ingest", async (req: Request, res: Response) => {
+    try {
+      const { device_id, organization_id, activities, events, status, dropped_events } = req.body;
+      
+      // Validate required fields
+      if (!device_id || !organization_id) {
+        return res.status(400).json({ message: "Missing required fields: device_id and organization_id are required" });
+      }
+      
+      const activityCount = Array.isArray(activities) ? activities.length : 0;
+      const eventCount = Array.isArray(events) ? events.length : 0;
+      
+      // In a real implementation, you would store the activities and events in the database
+      // For now, we'll just log them
+      console.log(`Ingest from device ${device_id} (organization ${organization_id}): ${activityCount} activities, ${eventCount} events`);
+      
+      // The agent's running total of events it had to discard while offline
+      if (dropped_events) {
+        console.log(`Device ${device_id} has dropped ${dropped_events} events since it started`);
+      }
+      
+      // Agents fold their periodic heartbeat into the batch instead of calling /agent-status
+      if (status) {
+        console.log(`Heartbeat from device ${device_id}: CPU ${status.cpu_usage}%, memory ${status.memory_usage}%, idle: ${status.is_idle}`);
+      }
+      
+      res.status(200).json({
+        message: "Data received",
+        activities: activityCount,
+        events: eventCount
+      });
+    } catch (error) {
+      console.error("Error handling agent ingest:", error);
+      res.status(500).json({ message: "Internal server error" });
+    }
+  });
+
   // Desktop Agent Download Endpoints - Auto-configured with organization ID
   router.get("/agent/download/:platform", async (req: Request, res: Response) => {
     try {
@@ -1331,9 +1370,11 @@ In a production environment, this would contain the actual agent software.`;
     }, 30000);
     
     // Handle incoming messages
-    ws.on('message', async (message: string) => {
+    ws.on('message', async (message: Buffer) => {
       try {
-        const data = JSON.parse(message);
+        // Desktop agents gzip larger frames themselves (1f 8b is the gzip magic number)
+        const raw = message[0] === 0x1f && message[1] === 0x8b ? gunzipSync(message) : message;
+        const data = JSON.parse(raw.toString());
         
         // Handle real-time events from desktop agents
         if (data.event === 'activity_update' && data.userId) {
@@ -1438,6 +1479,21 @@ In a production environment, this would contain the actual agent software.`;
             }
           }
         }
+        
+        // Handle batched activity samples and events from desktop agents
+        if (data.event === 'ingest' && data.userId) {
+          if (data.data) {
+            const activityCount = Array.isArray(data.data.activities) ? data.data.activities.length : 0;
+            const eventCount = Array.isArray(data.data.events) ? data.data.events.length : 0;
+            
+            // In a real implementation, you would store the activities and events in the database
+            console.log(`WebSocket ingest from device ${data.userId}: ${activityCount} activities, ${eventCount} events`);
+            
+            if (data.data.status) {
+              console.log(`Heartbeat from device ${data.userId}: CPU ${data.data.status.cpu_usage}%, memory ${data.data.status.memory_usage}%, idle: ${data.data.status.is_idle}`);
+            }
+          }
+        }
       } catch (error) {
         console.error('Error processing WebSocket message:', error);
       }